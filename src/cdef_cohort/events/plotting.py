@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from pathlib import Path
 
@@ -12,102 +13,141 @@ from cdef_cohort.logging_config import logger
 getLogger("matplotlib.font_manager").disabled = True
 
 
-def save_time_series_data(df: pl.LazyFrame, output_dir: Path) -> None:
+def get_event_types(df: pl.LazyFrame) -> list[str]:
+    """
+    Get the sorted list of distinct event types.
+
+    Args:
+        df (pl.LazyFrame): A LazyFrame containing event data with an 'event_type' column.
+
+    Returns:
+        list[str]: The distinct event types.
+    """
+    return df.select(pl.col("event_type").unique().sort()).collect().to_series().to_list()
+
+
+def event_type_counts(event_types: list[str]) -> list[pl.Expr]:
+    """
+    Build one count expression per event type.
+
+    Used inside a `group_by().agg()` this produces the same wide frame as pivoting the
+    counts on 'event_type', but stays in the lazy plan since the columns are known up front.
+
+    Args:
+        event_types (list[str]): The event types to produce columns for.
+
+    Returns:
+        list[pl.Expr]: Expressions counting the rows of each event type.
+    """
+    return [(pl.col("event_type") == event_type).sum().alias(event_type) for event_type in event_types]
+
+
+def build_plot_plans(
+    df: pl.LazyFrame, event_types: list[str], group_col: str = "year"
+) -> dict[str, pl.LazyFrame]:
+    """
+    Build the aggregation plans backing every plot data file.
+
+    All plans derive from the same LazyFrame, so evaluating them together with
+    `pl.collect_all` lets Polars share the scan instead of re-reading the events once per plot.
+
+    Args:
+        df (pl.LazyFrame): A LazyFrame containing event data with 'PNR', 'year' and 'event_type' columns.
+        event_types (list[str]): The distinct event types in the data.
+        group_col (str): The name of the column to use for grouping the stacked bar data.
+
+    Returns:
+        dict[str, pl.LazyFrame]: Aggregation plans keyed by the data they produce.
+    """
+    categorical_cols = df.select(cs.categorical()).collect_schema().names()
+    counts = event_type_counts(event_types)
+
+    plans = {
+        "time_series": (
+            df.with_columns(pl.col("year").cast(pl.Int32)).group_by("year").agg(counts).sort("year")
+        ),
+        "heatmap": df.group_by("PNR").agg(counts),
+        "stacked_bar": df.group_by(group_col).agg(counts).sort(group_col),
+        "sankey_edges": (
+            df.select(["PNR", "event_type", "year"])
+            .sort(["PNR", "year"])
+            .with_columns(pl.col("event_type").shift(-1).over("PNR").alias("next_event_type"))
+            .drop_nulls("next_event_type")
+            .group_by(["event_type", "next_event_type"])
+            .agg(pl.len().alias("value"))
+        ),
+        "event_type_counts": (
+            df.group_by("event_type").agg(pl.len().alias("count")).sort("count", descending=True)
+        ),
+        "survival": (
+            df.with_columns(pl.col("year").min().alias("min_year"))
+            .group_by(["PNR", "event_type"])
+            .agg(
+                time_to_event=(pl.col("year").min() - pl.col("min_year").first()).cast(pl.Int32),
+                E=pl.len(),
+            )
+            .drop_nulls()
+        ),
+    }
+    for cat_col in categorical_cols:
+        plans[f"time_series:{cat_col}"] = df.group_by(["year", cat_col]).agg(pl.len().alias("count"))
+        plans[f"stacked_bar:{cat_col}"] = df.group_by([group_col, cat_col]).agg(pl.len().alias("count"))
+
+    return plans
+
+
+def save_time_series_data(
+    event_counts: pl.DataFrame, category_counts: dict[str, pl.DataFrame], output_dir: Path
+) -> None:
     """
     Save time series data of event occurrences to CSV files.
 
     Args:
-        df (pl.LazyFrame): A LazyFrame containing event data with 'year' and 'event_type' columns.
+        event_counts (pl.DataFrame): Event counts per 'year', one column per event type.
+        category_counts (dict[str, pl.DataFrame]): Counts per 'year' for each categorical column.
         output_dir (Path): Directory to save the CSV files.
     """
-    event_counts = (
-        df.with_columns(pl.col("year").cast(pl.Int32))
-        .group_by(["year", "event_type"])
-        .count()
-        .collect()
-        .pivot(
-            values="count",
-            index="year",
-            on="event_type",
-            aggregate_function="first",
-        )
-        .fill_null(0)
-    )
     event_counts.write_csv(output_dir / "event_occurrences.csv")
 
-    categorical_cols = df.select(cs.categorical()).columns
-    for cat_col in categorical_cols:
-        cat_counts = (
-            df.group_by(["year", cat_col])
-            .count()
-            .collect()
-            .pivot(values="count", index="year", on=cat_col)
-            .fill_null(0)
-        )
+    for cat_col, counts in category_counts.items():
+        cat_counts = counts.pivot(values="count", index="year", on=cat_col).fill_null(0)
         cat_counts.write_csv(output_dir / f"{cat_col}_distribution.csv")
 
 
-def save_event_heatmap_data(df: pl.LazyFrame, output_dir: Path) -> None:
+def save_event_heatmap_data(pnr_event_counts: pl.DataFrame, output_dir: Path) -> None:
     """
     Save event co-occurrence data for heatmap to a CSV file.
 
     Args:
-        df (pl.LazyFrame): A LazyFrame containing event data with 'PNR' and 'event_type' columns.
+        pnr_event_counts (pl.DataFrame): Event counts per 'PNR', one column per event type.
         output_dir (Path): Directory to save the CSV file.
     """
-    event_pivot = (
-        df.collect()
-        .pivot(
-            values="year",
-            index="PNR",
-            on="event_type",
-            aggregate_function="len",
-        )
-        .fill_null(0)
-    )
-    numeric_cols = cs.expand_selector(event_pivot, cs.numeric())
-    event_pivot_numeric = event_pivot.select(numeric_cols)
-    corr = event_pivot_numeric.corr()
+    numeric_cols = cs.expand_selector(pnr_event_counts, cs.numeric())
+    corr = pnr_event_counts.select(numeric_cols).corr()
     corr.write_csv(output_dir / "event_correlation.csv")
 
 
-def save_stacked_bar_data(df: pl.LazyFrame, group_col: str, output_dir: Path) -> None:
+def save_stacked_bar_data(
+    grouped: pl.DataFrame, category_grouped: dict[str, pl.DataFrame], group_col: str, output_dir: Path
+) -> None:
     """
     Save data for stacked bar chart to CSV files.
 
     Args:
-        df (pl.LazyFrame):
-            A LazyFrame containing event data with 'event_type' and the specified group column.
+        grouped (pl.DataFrame): Event counts per group column, one column per event type.
+        category_grouped (dict[str, pl.DataFrame]): Counts per group column for each categorical column.
         group_col (str): The name of the column to use for grouping.
         output_dir (Path): Directory to save the CSV files.
     """
-    grouped = (
-        df.group_by([group_col, "event_type"])
-        .count()
-        .collect()
-        .pivot(
-            values="count",
-            index=group_col,
-            on="event_type",
-            aggregate_function="first",
-        )
-        .fill_null(0)
-    )
-
     grouped_pct = grouped.select(
         pl.col(group_col), pl.all().exclude(group_col) / pl.all().exclude(group_col).sum()
     )
     grouped_pct.write_csv(output_dir / f"event_distribution_{group_col}.csv")
 
-    categorical_cols = df.select(cs.categorical()).columns
-    for cat_col in categorical_cols:
-        cat_grouped = (
-            df.group_by([group_col, cat_col])
-            .count()
-            .collect()
-            .pivot(values="count", index=group_col, on=cat_col, aggregate_function="first")
-            .fill_null(0)
-        )
+    for cat_col, counts in category_grouped.items():
+        cat_grouped = counts.pivot(
+            values="count", index=group_col, on=cat_col, aggregate_function="first"
+        ).fill_null(0)
         cat_grouped_pct = cat_grouped.select(
             pl.col(group_col), pl.all().exclude(group_col) / pl.all().exclude(group_col).sum()
         )
@@ -115,64 +155,48 @@ def save_stacked_bar_data(df: pl.LazyFrame, group_col: str, output_dir: Path) ->
 
 
 def save_sankey_data(
-    df: pl.LazyFrame, event_sequence: list[str], top_n: int, min_count: int, output_dir: Path
+    edges: pl.DataFrame, event_type_counts: pl.DataFrame, top_n: int, min_count: int, output_dir: Path
 ) -> None:
-    """Save Sankey diagram data to a CSV file."""
-    flows = (
-        df.select(["PNR", "event_type", "year"])
-        .rename({"year": "year"})
-        .sort(["PNR", "year"])
-        .group_by("PNR")
-        .agg(pl.col("event_type").alias("event_sequence"))
-        .select(pl.col("event_sequence").list.join("-"))
-        .group_by("event_sequence")
-        .count()
-        .sort("count", descending=True)
-        .collect()
-    )
+    """
+    Save Sankey diagram data to a CSV file.
 
-    top_events = set(
-        df.group_by("event_type")
-        .count()
-        .sort("count", descending=True)
-        .limit(top_n)
-        .collect()["event_type"]
+    Args:
+        edges (pl.DataFrame): Transition counts per 'event_type' and 'next_event_type'.
+        event_type_counts (pl.DataFrame): Event counts per 'event_type', sorted descending.
+        top_n (int): Number of most frequent event types to keep; the rest are grouped as 'Other'.
+        min_count (int): Minimum number of transitions for an edge to be kept.
+        output_dir (Path): Directory to save the CSV file.
+    """
+    top_events = event_type_counts.head(top_n)["event_type"].to_list()
+
+    def bucket(col: str) -> pl.Expr:
+        event_type = pl.col(col).cast(pl.Utf8)
+        return pl.when(event_type.is_in(top_events)).then(event_type).otherwise(pl.lit("Other"))
+
+    sankey_data = (
+        edges.select(bucket("event_type").alias("source"), bucket("next_event_type").alias("target"), "value")
+        .filter(pl.col("source") != pl.col("target"))
+        .group_by(["source", "target"])
+        .agg(pl.col("value").sum())
+        .filter(pl.col("value") >= min_count)
+        .sort("value", descending=True)
     )
 
-    sankey_data = []
-
-    for sequence, count in zip(flows["event_sequence"], flows["count"], strict=False):
-        if count < min_count:
-            continue
-        events = sequence.split("-")
-        for i in range(len(events) - 1):
-            src = events[i] if events[i] in top_events else "Other"
-            tgt = events[i + 1] if events[i + 1] in top_events else "Other"
-            if src != tgt:
-                sankey_data.append({"source": src, "target": tgt, "value": count})
+    sankey_data.write_csv(output_dir / "sankey_data.csv")
 
-    pl.DataFrame(sankey_data).write_csv(output_dir / "sankey_data.csv")
 
-
-def save_survival_curve_data(df: pl.LazyFrame, event_type: str, output_dir: Path) -> None:
+def save_survival_curve_data(survival: pl.DataFrame, event_type: str, output_dir: Path) -> None:
     """
     Save survival curve data to a CSV file.
 
     Args:
-        df (pl.LazyFrame):
-            A LazyFrame containing event data with 'PNR', 'event_type', and 'year' columns.
+        survival (pl.DataFrame):
+            Time to first event and event count per 'PNR' and 'event_type'.
         event_type (str): The specific event type to analyze.
         output_dir (Path): Directory to save the CSV file.
     """
     try:
-        event_df = df.filter(pl.col("event_type") == event_type).collect()
-        min_year = df.select(pl.min("year")).collect().item()
-
-        T = (
-            event_df.group_by("PNR")
-            .agg(time_to_event=(pl.col("year").min() - min_year).cast(pl.Int32), E=pl.count("PNR"))
-            .drop_nulls()
-        )
+        T = survival.filter(pl.col("event_type") == event_type).drop("event_type")
 
         if T.height == 0:
             logger.error(f"No valid data for survival analysis of {event_type}")
@@ -184,29 +208,45 @@ def save_survival_curve_data(df: pl.LazyFrame, event_type: str, output_dir: Path
         logger.error(f"Error in saving survival data for {event_type}: {str(e)}", exc_info=True)
 
 
-def save_plot_data(df: pl.LazyFrame, output_dir: Path) -> None:
+def save_plot_data(df: pl.LazyFrame, output_dir: Path, event_types: list[str] | None = None) -> None:
     """
     Save all plot data to CSV files.
 
     Args:
         df (pl.LazyFrame): A LazyFrame containing event data.
         output_dir (Path): Directory to save the CSV files.
+        event_types (list[str] | None): The distinct event types, if already known.
+            Computed from `df` when not given.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    save_time_series_data(df, output_dir)
-    save_event_heatmap_data(df, output_dir)
-    save_stacked_bar_data(df, "year", output_dir)  # Assuming 'year' as the group column
-    save_sankey_data(
-        df,
-        df.select(pl.col("event_type").unique()).collect().to_series().to_list(),
-        5,
-        10,
-        output_dir,
-    )
+    group_col = "year"  # Assuming 'year' as the group column
+    if event_types is None:
+        event_types = get_event_types(df)
+    # Group on the physical enum codes rather than hashing the event type strings
+    df = df.with_columns(pl.col("event_type").cast(pl.Enum(event_types)))
+    plans = build_plot_plans(df, event_types, group_col)
+    data = dict(zip(plans, pl.collect_all(list(plans.values())), strict=True))
+
+    def by_category(prefix: str) -> dict[str, pl.DataFrame]:
+        return {key.split(":", 1)[1]: frame for key, frame in data.items() if key.startswith(f"{prefix}:")}
+
+    # The aggregated frames are independent, so write them concurrently
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(save_time_series_data, data["time_series"], by_category("time_series"), output_dir),
+            executor.submit(save_event_heatmap_data, data["heatmap"], output_dir),
+            executor.submit(
+                save_stacked_bar_data, data["stacked_bar"], by_category("stacked_bar"), group_col, output_dir
+            ),
+            executor.submit(save_sankey_data, data["sankey_edges"], data["event_type_counts"], 5, 10, output_dir),
+        ]
+        futures.extend(
+            executor.submit(save_survival_curve_data, data["survival"], event_type, output_dir)
+            for event_type in event_types
+        )
 
-    event_types = df.select(pl.col("event_type").unique()).collect().to_series().to_list()
-    for event_type in event_types:
-        save_survival_curve_data(df, event_type, output_dir)
+        for future in futures:
+            future.result()
 
     logger.info(f"All plot data has been saved to {output_dir}")
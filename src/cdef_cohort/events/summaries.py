@@ -20,7 +20,7 @@ def generate_summary_table(df: pl.LazyFrame) -> pl.DataFrame:
         pl.DataFrame:
             A DataFrame with summary statistics for event types and categorical columns.
     """
-    event_counts = df.group_by("event_type").agg(pl.count("PNR").alias("count"))
+    event_counts = df.group_by("event_type").agg(pl.len().alias("count"))
     total_cohort = df.select(pl.n_unique("PNR")).collect().item()
 
     summary = event_counts.with_columns(
@@ -33,7 +33,7 @@ def generate_summary_table(df: pl.LazyFrame) -> pl.DataFrame:
     # Add summary for categorical columns
     categorical_cols = df.select(cs.categorical()).columns
     for cat_col in categorical_cols:
-        cat_summary = df.group_by(cat_col).agg(pl.count("PNR").alias("count"))
+        cat_summary = df.group_by(cat_col).agg(pl.len().alias("count"))
         cat_summary = cat_summary.with_columns(
             [
                 (pl.col("count") / total_cohort * 100).alias("% of Cohort"),
@@ -60,11 +60,36 @@ def generate_descriptive_stats(df: pl.LazyFrame, numeric_cols: list[str]) -> pl.
     Returns:
         pl.DataFrame: A transposed DataFrame with descriptive statistics for each column.
     """
-    # Select only the numeric columns and collect
-    numeric_df = df.select(numeric_cols).collect()
-
-    # Generate descriptive statistics for numeric columns
-    stats = numeric_df.describe()
+    # Compute the same statistics as DataFrame.describe() in the query engine,
+    # so only a single row of aggregates is materialized
+    statistics = {
+        "count": lambda col: pl.col(col).count(),
+        "null_count": lambda col: pl.col(col).null_count(),
+        "mean": lambda col: pl.col(col).mean(),
+        "std": lambda col: pl.col(col).std(),
+        "min": lambda col: pl.col(col).min(),
+        "25%": lambda col: pl.col(col).quantile(0.25, interpolation="nearest"),
+        "50%": lambda col: pl.col(col).quantile(0.5, interpolation="nearest"),
+        "75%": lambda col: pl.col(col).quantile(0.75, interpolation="nearest"),
+        "max": lambda col: pl.col(col).max(),
+    }
+    aggregates = (
+        df.select(
+            [
+                expr(col).cast(pl.Float64).alias(f"{col}:{name}")
+                for col in numeric_cols
+                for name, expr in statistics.items()
+            ]
+        )
+        .collect()
+        .row(0, named=True)
+    )
+    stats = pl.DataFrame(
+        {
+            "statistic": list(statistics),
+            **{col: [aggregates[f"{col}:{name}"] for name in statistics] for col in numeric_cols},
+        }
+    )
 
     # Generate statistics for categorical columns
     categorical_cols = df.select(cs.categorical()).columns
@@ -82,6 +107,8 @@ def create_interactive_dashboard(df: pl.LazyFrame) -> go.Figure:
 
     This function generates a scatter plot dashboard showing event counts over years,
     with interactive features like hover data and color-coding by event type.
+    Points are aggregated per year and event type, so the figure size does not grow
+    with the number of individuals.
 
     Args:
         df (pl.LazyFrame): A LazyFrame containing event data with columns
@@ -90,17 +117,14 @@ def create_interactive_dashboard(df: pl.LazyFrame) -> go.Figure:
     Returns:
         go.Figure: A Plotly Figure object representing the interactive dashboard.
     """
-    # Collect necessary data for the dashboard
-    categorical_cols = df.select(cs.categorical()).columns
-    dashboard_data = df.select(
-        [
-            "year",
-            "event_type",
-            "PNR",
-            pl.count("PNR").over(["year", "event_type"]).alias("count"),
-            *categorical_cols,
-        ]
-    ).collect()
+    # Aggregate to one point per year, event type and category instead of one per PNR
+    categorical_cols = df.select(cs.categorical()).collect_schema().names()
+    dashboard_data = (
+        df.group_by(["year", "event_type", *categorical_cols])
+        .agg(pl.len().alias("count"))
+        .sort(["year", "event_type"])
+        .collect()
+    )
 
     fig = px.scatter(
         dashboard_data.to_pandas(),
@@ -108,7 +132,7 @@ def create_interactive_dashboard(df: pl.LazyFrame) -> go.Figure:
         y="event_type",
         color="event_type",
         size="count",
-        hover_data=["PNR"] + categorical_cols,
+        hover_data=categorical_cols,
         title="Interactive Event Dashboard",
         labels={"year": "Year", "event_type": "Event Type", "count": "Event Count"},
     )
@@ -140,7 +164,7 @@ def generate_event_frequency_analysis(
     """
     yearly_freq = (
         df.group_by(["year", "event_type"])
-        .agg(pl.count("PNR").alias("event_count"))
+        .agg(pl.len().alias("event_count"))
         .sort(["year", "event_count"], descending=[False, True])
         .collect()
     )
@@ -159,7 +183,7 @@ def generate_event_frequency_analysis(
             .alias("age_group")
         )
         .group_by(["age_group", "event_type"])
-        .agg(pl.count("PNR").alias("event_count"))
+        .agg(pl.len().alias("event_count"))
         .sort(["age_group", "event_count"], descending=[False, True])
         .collect()
     )
@@ -170,7 +194,7 @@ def generate_event_frequency_analysis(
     for cat_col in categorical_cols:
         cat_freq[cat_col] = (
             df.group_by([cat_col, "event_type"])
-            .agg(pl.count("PNR").alias("event_count"))
+            .agg(pl.len().alias("event_count"))
             .sort([cat_col, "event_count"], descending=[False, True])
             .collect()
         )
@@ -194,6 +194,10 @@ class ServiceLogger:
         """Log critical message"""
         self._log_with_summary("critical", msg, *args, **kwargs)
 
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether messages at the given level would be logged"""
+        return self.logger.isEnabledFor(level)
+
     def setLevel(self, level: str) -> None:
         """Set logging level"""
         validated_level = validate_log_level(level)
@@ -12,6 +12,7 @@ from cdef_cohort.schemas.all import (
     UDDF_SCHEMA,
 )
 from cdef_cohort.services.container import get_container
+from cdef_cohort.services.data_service import sink_parquet
 from cdef_cohort.settings import settings
 
 
@@ -163,7 +164,10 @@ def main(output_dir: Path | None = None) -> pl.LazyFrame:
             # Ensure the population file is generated
             population_service = container.get_population_service()
             population_result = population_service.process_population()
-            population_result.collect().write_parquet(settings.POPULATION_FILE)
+            data_service = container.get_data_service()
+            data_service.write_parquet(population_result, Path(settings.POPULATION_FILE))
+            # Keep an IPC copy for the register joins, which re-read the population for every register
+            data_service.write_ipc(data_service.read_parquet(settings.POPULATION_FILE), settings.POPULATION_IPC_FILE)
             logger.info(f"Population file generated at: {settings.POPULATION_FILE}")
 
             # Configure cohort service
@@ -324,5 +328,5 @@ def main(output_dir: Path | None = None) -> pl.LazyFrame:
 
 if __name__ == "__main__":
     result = main()
-    # Optionally collect and write the result here
-    result.collect().write_parquet("final_output.parquet")
+    # Optionally stream the result to disk here (collected if the plan cannot be streamed)
+    sink_parquet(result, "final_output.parquet")
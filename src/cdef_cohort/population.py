@@ -11,28 +11,23 @@ from cdef_cohort.utils.config import (
     MFR_FILES,  # Need to add this to config
     POPULATION_FILE,
 )
-from cdef_cohort.utils.date import parse_dates
+from cdef_cohort.utils.date import parse_dates, parse_dates_sampled
+
+ID_COLUMNS = ["PNR", "FAR_ID", "MOR_ID", "FAMILIE_ID"]
 
 
 def read_bef_data() -> pl.LazyFrame:
     """Read BEF data and return a LazyFrame with standardized columns."""
     logger.info(f"Reading BEF data from: {BEF_FILES}")
 
-    return (
-        pl.read_parquet(
-            BEF_FILES,
-            columns=["PNR", "FAR_ID", "MOR_ID", "FAMILIE_ID", "FOED_DAG"],
-            schema={
-                "PNR": pl.Utf8,
-                "FAR_ID": pl.Utf8,
-                "MOR_ID": pl.Utf8,
-                "FAMILIE_ID": pl.Utf8,
-                "FOED_DAG": pl.Utf8,
-            },
-        )
-        .lazy()
-        .with_columns([parse_dates("FOED_DAG")])
+    # Select right after the scan so only these columns are read from the parquet files.
+    # With "prefiltered", the birth year filter in get_unique_children is evaluated on FOED_DAG
+    # first and the remaining columns are only decoded for matching rows.
+    bef = pl.scan_parquet(BEF_FILES, parallel="prefiltered").select(
+        [pl.col(col).cast(pl.Utf8) for col in ["PNR", "FAR_ID", "MOR_ID", "FAMILIE_ID", "FOED_DAG"]]
     )
+    # The format is detected from the first rows of each file, so usually only one format is parsed
+    return bef.with_columns(parse_dates_sampled(bef, ["FOED_DAG"], source=BEF_FILES))
 
 
 def read_mfr_data() -> pl.LazyFrame | None:
@@ -47,17 +42,8 @@ def read_mfr_data() -> pl.LazyFrame | None:
             return None
 
         return (
-            pl.read_parquet(
-                MFR_FILES,
-                columns=["CPR_BARN", "CPR_FADER", "CPR_MODER", "FOEDSELSDATO"],
-                schema={
-                    "CPR_BARN": pl.Utf8,
-                    "CPR_FADER": pl.Utf8,
-                    "CPR_MODER": pl.Utf8,
-                    "FOEDSELSDATO": pl.Utf8,
-                },
-            )
-            .lazy()
+            pl.scan_parquet(MFR_FILES, parallel="prefiltered")
+            .select([pl.col(col).cast(pl.Utf8) for col in ["CPR_BARN", "CPR_FADER", "CPR_MODER", "FOEDSELSDATO"]])
             .with_columns([parse_dates("FOEDSELSDATO")])
             .select(
                 [
@@ -74,7 +60,7 @@ def read_mfr_data() -> pl.LazyFrame | None:
         return None
 
 
-def get_unique_children(df: pl.LazyFrame) -> pl.DataFrame:
+def get_unique_children(df: pl.LazyFrame) -> pl.LazyFrame:
     """Filter and get unique children from the data."""
     return (
         df.filter(
@@ -82,16 +68,7 @@ def get_unique_children(df: pl.LazyFrame) -> pl.DataFrame:
             & (pl.col("FOED_DAG").dt.year() <= BIRTH_INCLUSION_END_YEAR),
         )
         .select(["PNR", "FOED_DAG", "FAR_ID", "MOR_ID", "FAMILIE_ID"])
-        .group_by("PNR")
-        .agg(
-            [
-                pl.col("FOED_DAG").first(),
-                pl.col("FAR_ID").first(),
-                pl.col("MOR_ID").first(),
-                pl.col("FAMILIE_ID").first(),
-            ]
-        )
-        .collect()
+        .unique(subset=["PNR"], keep="first", maintain_order=False)
     )
 
 
@@ -150,9 +127,22 @@ def combine_children_data(
     return combined, summary_before, summary_after
 
 
-def process_parents(bef_data: pl.LazyFrame) -> pl.DataFrame:
-    """Process parent information from BEF data."""
-    return bef_data.select(["PNR", "FOED_DAG"]).group_by("PNR").agg([pl.col("FOED_DAG").first()]).collect()
+def get_parent_ids(children: list[pl.LazyFrame]) -> pl.LazyFrame:
+    """Get the distinct father and mother IDs of the given children as a 'PNR' column."""
+    return (
+        pl.concat([df.select(pl.col(col).alias("PNR")) for df in children for col in ["FAR_ID", "MOR_ID"]])
+        .drop_nulls()
+        .unique()
+    )
+
+
+def process_parents(bef_data: pl.LazyFrame, parent_ids: pl.LazyFrame) -> pl.LazyFrame:
+    """Process parent information from BEF data, restricted to the given parent IDs."""
+    return (
+        bef_data.select(["PNR", "FOED_DAG"])
+        .join(parent_ids, on="PNR", how="semi")
+        .unique(subset=["PNR"], keep="first", maintain_order=False)
+    )
 
 
 def create_family_data(children: pl.DataFrame, parents: pl.DataFrame) -> pl.DataFrame:
@@ -188,33 +178,43 @@ def create_family_data(children: pl.DataFrame, parents: pl.DataFrame) -> pl.Data
 def main() -> None:
     logger.info("Starting population processing")
 
-    # Read data
-    bef_data = read_bef_data()
-    mfr_data = read_mfr_data()
-
-    # Process children from BEF data
-    bef_children = get_unique_children(bef_data)
-
-    if mfr_data is not None:
-        # If we have MFR data, process and combine it
-        mfr_children = get_unique_children(mfr_data)
-        combined_children, summary_before, summary_after = combine_children_data(bef_children, mfr_children)
-    else:
-        # If no MFR data, just use BEF data
-        logger.info("Processing without MFR data - using BEF data only")
-        combined_children = bef_children
-        summary_before = create_data_summary(bef_children, "bef")
-        summary_after = {
-            "total_combined_records": len(bef_children),
-            "combined_missing_far": bef_children["FAR_ID"].null_count(),
-            "combined_missing_mor": bef_children["MOR_ID"].null_count(),
-            "records_only_in_bef": len(bef_children),
-            "records_only_in_mfr": 0,
-        }
-
-    # Process parents and create final family data
-    parents = process_parents(bef_data)
-    family = create_family_data(combined_children, parents)
+    # The ID columns are categorical under a shared string cache while processing, so
+    # the deduplication, parent lookup and family joins hash integer codes, not strings
+    with pl.StringCache():
+        # Read data
+        bef_data = read_bef_data().with_columns(pl.col(ID_COLUMNS).cast(pl.Categorical))
+        mfr_data = read_mfr_data()
+        if mfr_data is not None:
+            mfr_data = mfr_data.with_columns(pl.col(ID_COLUMNS).cast(pl.Categorical))
+
+        # Collect children and parents together so the BEF scan is shared between them.
+        # Only the parents of included children are looked up, which keeps the parent
+        # aggregation and the family joins small.
+        children = [get_unique_children(bef_data)]
+        if mfr_data is not None:
+            children.append(get_unique_children(mfr_data))
+        parents_plan = process_parents(bef_data, get_parent_ids(children))
+        parents, bef_children, *mfr_results = pl.collect_all([parents_plan, *children])
+
+        if mfr_results:
+            # If we have MFR data, combine it
+            mfr_children = mfr_results[0]
+            combined_children, summary_before, summary_after = combine_children_data(bef_children, mfr_children)
+        else:
+            # If no MFR data, just use BEF data
+            logger.info("Processing without MFR data - using BEF data only")
+            combined_children = bef_children
+            summary_before = create_data_summary(bef_children, "bef")
+            summary_after = {
+                "total_combined_records": len(bef_children),
+                "combined_missing_far": bef_children["FAR_ID"].null_count(),
+                "combined_missing_mor": bef_children["MOR_ID"].null_count(),
+                "records_only_in_bef": len(bef_children),
+                "records_only_in_mfr": 0,
+            }
+
+        # Create final family data, writing the IDs back out as strings
+        family = create_family_data(combined_children, parents).with_columns(pl.col(ID_COLUMNS).cast(pl.Utf8))
 
     # Save results
     output_dir = Path(POPULATION_FILE).parent
@@ -225,6 +225,8 @@ def main() -> None:
 
     # Save final dataset
     family.write_parquet(POPULATION_FILE)
+    # Uncompressed IPC copy, memory-mapped by the register joins
+    family.write_ipc(Path(POPULATION_FILE).with_suffix(".arrow"), compression=None)
     save_population_summary(family, output_dir)
 
     logger.info("Population processing completed")
@@ -6,9 +6,13 @@ import polars as pl
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.event_service import EventService
 from cdef_cohort.services.mapping_service import MappingService
+from cdef_cohort.utils.columns import validate_and_select_columns
 
 T = TypeVar("T")
 
+# Rows per row group for register outputs sorted by PNR; keeps each group's PNR range tight
+REGISTER_ROW_GROUP_SIZE = 1_000_000
+
 
 class BaseProcessor(ABC):
     def __init__(self, data_service: DataService, event_service: EventService, mapping_service: MappingService):
@@ -29,6 +33,14 @@ class BaseProcessor(ABC):
         """Process the register data"""
         pass
 
+    def select_columns(self, df: pl.LazyFrame) -> pl.LazyFrame:
+        """Keep only the configured columns, so unused columns are never read from the scan"""
+        columns_to_keep = self.defaults.get("columns_to_keep")
+        if not columns_to_keep:
+            return df
+        _, df = validate_and_select_columns(df, columns_to_keep, select_columns=True)
+        return df
+
     def validate(self, df: pl.LazyFrame) -> bool:
         """Validate dataframe schema and contents"""
         try:
@@ -4,7 +4,7 @@ from typing import Any
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.registers.base import BaseProcessor
+from cdef_cohort.registers.base import REGISTER_ROW_GROUP_SIZE, BaseProcessor
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.event_service import EventService
 from cdef_cohort.services.mapping_service import MappingService
@@ -31,11 +31,11 @@ class BEFProcessor(BaseProcessor):
         "FM_MARK": pl.Categorical,  # Family mark
         "FOED_DAG": pl.Date,  # Date of birth
         "HUSTYPE": pl.Categorical,  # Household type
-        "IE_TYPE": pl.Utf8,  # Immigration/emigration type
-        "KOEN": pl.Utf8,  # Gender
+        "IE_TYPE": pl.Categorical,  # Immigration/emigration type
+        "KOEN": pl.Categorical,  # Gender
         "KOM": pl.Int8,  # Municipality code
         "MOR_ID": pl.Utf8,  # PNR of the mother
-        "OPR_LAND": pl.Utf8,  # Country of origin
+        "OPR_LAND": pl.Categorical,  # Country of origin
         "PLADS": pl.Categorical,  # The person's place in the family
         "PNR": pl.Utf8,  # CPR/PNR number
         "REG": pl.Categorical,  # Region
@@ -99,6 +99,8 @@ class BEFProcessor(BaseProcessor):
                 pl.col("PLADS").cast(pl.Utf8).pipe(self.mapping_service.apply_mapping, "plads"),
                 pl.col("REG").cast(pl.Utf8).pipe(self.mapping_service.apply_mapping, "reg"),
                 pl.col("STATSB").cast(pl.Utf8).pipe(self.mapping_service.apply_mapping, "statsb"),
+                # Low-cardinality codes are stored as dictionary indices rather than strings
+                pl.col(["IE_TYPE", "KOEN", "OPR_LAND"]).cast(pl.Categorical),
             ]
         )
 
@@ -109,14 +111,14 @@ class BEFProcessor(BaseProcessor):
     def process(self, **kwargs: KwargsType) -> None:
         logger.info("Processing BEF data")
         try:
-            # Read data
-            df = self.data_service.read_parquet(BEF_FILES)
+            # Read data, selecting the kept columns first so the rest are never decoded
+            df = self.select_columns(self.data_service.read_parquet(BEF_FILES))
 
             # Preprocess
             df = self.preprocess(df)
 
             # Write output
-            self.data_service.write_parquet(df, BEF_OUT)
+            self.data_service.write_parquet(df.sort("PNR"), BEF_OUT, row_group_size=REGISTER_ROW_GROUP_SIZE)
             logger.info("BEF processing completed successfully")
 
         except Exception as e:
@@ -4,14 +4,17 @@ from typing import Any
 
 import polars as pl
 from polars.datatypes import DataTypeClass
-from tqdm import tqdm
 
 from cdef_cohort.logging_config import logger
+from cdef_cohort.registers.base import REGISTER_ROW_GROUP_SIZE
+from cdef_cohort.services.data_service import sink_parquet
 from cdef_cohort.utils.columns import validate_and_select_columns
-from cdef_cohort.utils.date import extract_date_from_filename, parse_dates
+from cdef_cohort.utils.date import parse_dates_sampled
 from cdef_cohort.utils.isced import read_isced_data
 from cdef_cohort.utils.types import KwargsType
 
+SOURCE_FILE_COLUMN = "__source_file"
+
 
 def process_register_data(
     input_files: Path | str,
@@ -46,18 +49,16 @@ def process_register_data(
 
     input_path = Path(input_files)
     file_pattern = input_path / "*.parquet" if input_path.is_dir() else input_path
-    files = list(file_pattern.parent.glob(file_pattern.name))
 
-    if not files:
+    if not any(file_pattern.parent.glob(file_pattern.name)):
         logger.error(f"No parquet files found matching pattern: {file_pattern}")
         raise FileNotFoundError(f"No parquet files found matching pattern: {file_pattern}")
 
-    logger.info(f"Found {len(files)} parquet files")
-
+    # Polars expands the glob itself, so the files are only checked for, not listed
     if longitudinal:
-        data = process_longitudinal_data(files, columns_to_keep)
+        data = process_longitudinal_data(file_pattern, columns_to_keep)
     else:
-        data = pl.scan_parquet(files, allow_missing_columns=True)
+        data = pl.scan_parquet(file_pattern, allow_missing_columns=True, parallel="prefiltered")
         if columns_to_keep:
             valid_columns, data = validate_and_select_columns(
                 data, columns_to_keep, select_columns=True
@@ -65,9 +66,12 @@ def process_register_data(
 
     # Parse date columns
     if date_columns:
-        for col in date_columns:
-            if col in data.collect_schema().names():
-                data = data.with_columns(parse_dates(col).alias(col))
+        schema_names = set(data.collect_schema().names())
+        data = data.with_columns(
+            parse_dates_sampled(
+                data, [col for col in date_columns if col in schema_names], source=file_pattern
+            )
+        )
 
     # Apply preprocessing function if provided
     if preprocess_func:
@@ -75,8 +79,14 @@ def process_register_data(
 
     # Special handling for UDDF register
     if register_name.lower() == "uddf":
-        isced_data = read_isced_data()
-        data = data.join(isced_data, left_on="HFAUDD", right_on="HFAUDD", how="left")
+        # The ISCED table is small and unique per HFAUDD, so gather EDU_LVL from it instead of
+        # hash joining every education record on the string code
+        isced_data = read_isced_data().collect()
+        data = data.with_columns(
+            pl.col("HFAUDD")
+            .replace_strict(isced_data.get_column("HFAUDD"), isced_data.get_column("EDU_LVL"), default=None)
+            .alias("EDU_LVL")
+        )
 
     # Join with population data if provided
     result = (
@@ -89,26 +99,33 @@ def process_register_data(
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Collect and save the result
-    result.collect().write_parquet(output_path)
+    # Stream the result to disk sorted by PNR, so row group statistics can prune PNR filters
+    sink_parquet(result.sort("PNR"), output_path, compression="zstd", row_group_size=REGISTER_ROW_GROUP_SIZE)
     logger.info(f"Processed {register_name} data and saved to {output_file}")
 
 
-def process_longitudinal_data(files: list[Path], columns_to_keep: list[str] | None) -> pl.LazyFrame:
-    data_frames = []
-    for file in tqdm(files, desc="Processing files"):
-        df = pl.scan_parquet(file, allow_missing_columns=True)
-        date_info = extract_date_from_filename(file.stem)
-        if "year" in date_info:
-            df = df.with_columns(pl.lit(date_info["year"]).alias("year"))
-        if "month" in date_info:
-            df = df.with_columns(pl.lit(date_info["month"]).alias("month"))
-        if columns_to_keep:
-            valid_columns, df = validate_and_select_columns(
-                df, columns_to_keep, select_columns=True
-            )
-        data_frames.append(df)
-    return pl.concat(data_frames)
+def process_longitudinal_data(file_pattern: Path, columns_to_keep: list[str] | None) -> pl.LazyFrame:
+    """Scan all files matching the pattern, taking 'year' and 'month' from each file name."""
+    file_name = pl.col(SOURCE_FILE_COLUMN).str.extract(r"([^/\\]+)$")
+    data = (
+        pl.scan_parquet(
+            file_pattern,
+            allow_missing_columns=True,
+            include_file_paths=SOURCE_FILE_COLUMN,
+            parallel="prefiltered",
+        )
+        .with_columns(
+            # Same rules as extract_date_from_filename: YYYYMM first, then a bare YYYY
+            pl.coalesce(file_name.str.extract(r"(\d{4})\d{2}"), file_name.str.extract(r"(\d{4})"))
+            .cast(pl.Int32)
+            .alias("year"),
+            file_name.str.extract(r"\d{4}(\d{2})").cast(pl.Int32).alias("month"),
+        )
+        .drop(SOURCE_FILE_COLUMN)
+    )
+    if columns_to_keep:
+        valid_columns, data = validate_and_select_columns(data, columns_to_keep, select_columns=True)
+    return data
 
 
 def join_with_population(
@@ -117,7 +134,27 @@ def join_with_population(
     join_on: str | list[str],
     join_parents_only: bool,
 ) -> pl.LazyFrame:
-    population = pl.scan_parquet(population_file)
+    # Prefer the uncompressed IPC copy of the population when it is at least as new as the
+    # parquet file: it is memory-mapped instead of being decoded again for every register
+    ipc_file = Path(population_file).with_suffix(".arrow")
+    if ipc_file.exists() and ipc_file.stat().st_mtime >= Path(population_file).stat().st_mtime:
+        population = pl.scan_ipc(ipc_file)
+    else:
+        population = pl.scan_parquet(population_file)
+
+    # Restrict the register to IDs that can match before joining. The ID list is small, and as
+    # an is_in predicate it reaches the parquet scan, where row groups outside it are skipped.
+    if isinstance(join_on, str):
+        key_columns = ["FAR_ID", "MOR_ID"] if join_parents_only else [join_on]
+        join_ids = (
+            pl.concat([population.select(pl.col(col).alias(join_on)) for col in key_columns])
+            .drop_nulls()
+            .unique()
+            .collect()
+            .to_series()
+        )
+        data = data.filter(pl.col(join_on).is_in(join_ids))
+
     if join_parents_only:
         result = join_parents(population, data, join_on)
     else:
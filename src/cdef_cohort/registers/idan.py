@@ -4,7 +4,7 @@ from typing import Any
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.registers.base import BaseProcessor
+from cdef_cohort.registers.base import REGISTER_ROW_GROUP_SIZE, BaseProcessor
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.event_service import EventService
 from cdef_cohort.services.mapping_service import MappingService
@@ -20,7 +20,7 @@ class IDANProcessor(BaseProcessor):
         "CPRTYPE": pl.Utf8,
         "CVRNR": pl.Utf8,
         "JOBKAT": pl.Int8,
-        "JOBLON": pl.Float64,
+        "JOBLON": pl.Float32,
         "LBNR": pl.Utf8,
         "PNR": pl.Utf8,
         "STILL": pl.Utf8,
@@ -66,20 +66,22 @@ class IDANProcessor(BaseProcessor):
             [
                 pl.col("JOBKAT").cast(pl.Utf8).pipe(self.mapping_service.apply_mapping, "jobkat"),
                 pl.col("TILKNYT").cast(pl.Utf8).pipe(self.mapping_service.apply_mapping, "tilknyt"),
+                # Salaries in DKK do not need double precision
+                pl.col("JOBLON").cast(pl.Float32),
             ]
         )
 
     def process(self, **kwargs: KwargsType) -> None:
         logger.info("Processing IDAN data")
         try:
-            # Read data
-            df = self.data_service.read_parquet(IDAN_FILES)
+            # Read data, selecting the kept columns first so the rest are never decoded
+            df = self.select_columns(self.data_service.read_parquet(IDAN_FILES))
 
             # Preprocess
             df = self.preprocess(df)
 
             # Write output
-            self.data_service.write_parquet(df, IDAN_OUT)
+            self.data_service.write_parquet(df.sort("PNR"), IDAN_OUT, row_group_size=REGISTER_ROW_GROUP_SIZE)
             logger.info("IDAN processing completed successfully")
 
         except Exception as e:
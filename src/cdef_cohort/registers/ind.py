@@ -17,8 +17,8 @@ class INDProcessor(BaseProcessor):
         "BESKST13": pl.Int8,
         "CPRTJEK": pl.Utf8,
         "CPRTYPE": pl.Utf8,
-        "LOENMV_13": pl.Float64,
-        "PERINDKIALT_13": pl.Float64,
+        "LOENMV_13": pl.Float32,
+        "PERINDKIALT_13": pl.Float32,
         "PNR": pl.Utf8,
         "PRE_SOCIO": pl.Int8,
         "VERSION": pl.Utf8,
@@ -48,8 +48,8 @@ class INDProcessor(BaseProcessor):
 
     def preprocess(self, df: pl.LazyFrame) -> pl.LazyFrame:
         logger.debug("Preprocessing IND data")
-        # Add any preprocessing specific to IND
-        return df
+        # Income amounts in DKK do not need double precision
+        return df.with_columns(pl.col(["LOENMV_13", "PERINDKIALT_13"]).cast(pl.Float32))
 
     def process(self, **kwargs: KwargsType) -> None:
         logger.info("Processing IND data")
@@ -269,8 +269,8 @@ class LongitudinalProcessor(BaseProcessor):
             if not longitudinal_data:
                 raise ValueError("No valid longitudinal data found.")
 
-            # Combine data
-            combined_data = pl.concat(longitudinal_data, how="diagonal")
+            # Combine data; the result is only sliced and written out, so skip the rechunk copy
+            combined_data = pl.concat(longitudinal_data, how="diagonal_relaxed", rechunk=False)
 
             # Define column selections
             child_cols = cs.by_name(["PNR", "year", "month"]) | (cs.all() - cs.starts_with("FAR_", "MOR_"))
@@ -281,6 +281,7 @@ class LongitudinalProcessor(BaseProcessor):
             logger.info("Processing child data")
             child_data = self.rename_duplicates(combined_data.select(child_cols))
             self.process_chunk(child_data, child_dir)
+            result_child = self.read_longitudinal_data(child_dir)
 
             # Process mother data
             result_mother = None
@@ -306,7 +307,7 @@ class LongitudinalProcessor(BaseProcessor):
             self.validate_data_structure(child_dir, mother_dir, father_dir)
 
             logger.info(f"Data processing completed. Data saved to {long_dir}")
-            return child_data, result_mother, result_father
+            return result_child, result_mother, result_father
 
         except Exception as e:
             logger.error(f"Error during data processing: {str(e)}")
@@ -4,7 +4,7 @@ from typing import Any
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.registers.base import BaseProcessor
+from cdef_cohort.registers.base import REGISTER_ROW_GROUP_SIZE, BaseProcessor
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.event_service import EventService
 from cdef_cohort.services.mapping_service import MappingService
@@ -51,7 +51,9 @@ class LPR3DiagnoserProcessor(BaseProcessor):
         try:
             df = self.data_service.read_parquet(LPR3_DIAGNOSER_FILES)
             df = self.preprocess(df)
-            self.data_service.write_parquet(df, LPR3_DIAGNOSER_OUT)
+            self.data_service.write_parquet(
+                df.sort("DW_EK_KONTAKT"), LPR3_DIAGNOSER_OUT, row_group_size=REGISTER_ROW_GROUP_SIZE
+            )
             logger.info("LPR3 Diagnoser processing completed successfully")
         except Exception as e:
             logger.error(f"Error processing LPR3 Diagnoser data: {str(e)}")
@@ -4,7 +4,7 @@ from typing import Any
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.registers.base import BaseProcessor
+from cdef_cohort.registers.base import REGISTER_ROW_GROUP_SIZE, BaseProcessor
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.event_service import EventService
 from cdef_cohort.services.mapping_service import MappingService
@@ -70,7 +70,9 @@ class LPR3KontakterProcessor(BaseProcessor):
         try:
             df = self.data_service.read_parquet(LPR3_KONTAKTER_FILES)
             df = self.preprocess(df)
-            self.data_service.write_parquet(df, LPR3_KONTAKTER_OUT)
+            self.data_service.write_parquet(
+                df.sort("DW_EK_KONTAKT"), LPR3_KONTAKTER_OUT, row_group_size=REGISTER_ROW_GROUP_SIZE
+            )
             logger.info("LPR3 Kontakter processing completed successfully")
         except Exception as e:
             logger.error(f"Error processing LPR3 Kontakter data: {str(e)}")
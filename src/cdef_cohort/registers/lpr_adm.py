@@ -4,7 +4,7 @@ from typing import Any
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.registers.base import BaseProcessor
+from cdef_cohort.registers.base import REGISTER_ROW_GROUP_SIZE, BaseProcessor
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.event_service import EventService
 from cdef_cohort.services.mapping_service import MappingService
@@ -82,7 +82,7 @@ class LPRAdmProcessor(BaseProcessor):
         try:
             df = self.data_service.read_parquet(LPR_ADM_FILES)
             df = self.preprocess(df)
-            self.data_service.write_parquet(df, LPR_ADM_OUT)
+            self.data_service.write_parquet(df.sort("RECNUM"), LPR_ADM_OUT, row_group_size=REGISTER_ROW_GROUP_SIZE)
             logger.info("LPR ADM processing completed successfully")
         except Exception as e:
             logger.error(f"Error processing LPR ADM data: {str(e)}")
@@ -4,7 +4,7 @@ from typing import Any
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.registers.base import BaseProcessor
+from cdef_cohort.registers.base import REGISTER_ROW_GROUP_SIZE, BaseProcessor
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.event_service import EventService
 from cdef_cohort.services.mapping_service import MappingService
@@ -50,9 +50,9 @@ class LPRBesProcessor(BaseProcessor):
     def process(self, **kwargs: KwargsType) -> None:
         logger.info("Processing LPR BES data")
         try:
-            df = self.data_service.read_parquet(LPR_BES_FILES)
+            df = self.select_columns(self.data_service.read_parquet(LPR_BES_FILES))
             df = self.preprocess(df)
-            self.data_service.write_parquet(df, LPR_BES_OUT)
+            self.data_service.write_parquet(df.sort("RECNUM"), LPR_BES_OUT, row_group_size=REGISTER_ROW_GROUP_SIZE)
             logger.info("LPR BES processing completed successfully")
         except Exception as e:
             logger.error(f"Error processing LPR BES data: {str(e)}")
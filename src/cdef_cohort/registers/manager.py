@@ -1,9 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from cdef_cohort.logging_config import logger
 from cdef_cohort.services.container import ServiceContainer
 
 from .factory import RegisterFactory
 
+# Registers run by RegisterManager.process_all; each only reads its own files and the population
+REGISTER_TYPES = ("akm", "bef", "idan", "ind", "uddf")
+
 
 class RegisterManager:
     def __init__(self, container: ServiceContainer):
@@ -25,6 +30,21 @@ class RegisterManager:
         processor.process(**kwargs)
 
     def process_all(self, **kwargs: Any) -> None:
-        """Process all registers"""
-        for register_type in ["akm", "bef", "idan", "ind", "uddf"]:
-            self.process_register(register_type, **kwargs)
+        """Process all registers concurrently.
+
+        The registers read and write disjoint files, and Polars releases the GIL while
+        scanning and writing, so threads are enough to overlap them. They share Polars'
+        global thread pool, so this does not oversubscribe the CPU.
+        """
+        with ThreadPoolExecutor(max_workers=len(REGISTER_TYPES)) as executor:
+            futures = [
+                (executor.submit(self.process_register, register_type, **kwargs), register_type)
+                for register_type in REGISTER_TYPES
+            ]
+
+            for future, register_type in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {register_type}: {str(e)}")
+                    raise
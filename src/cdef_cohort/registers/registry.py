@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from cdef_cohort.logging_config import logger
 from cdef_cohort.registers.base import BaseProcessor
 
 
@@ -14,9 +16,20 @@ class ProcessorRegistry:
         return self._processors[name]
 
     def process_all(self, **kwargs: Any) -> None:
-        """Process all registered processors"""
-        for processor in self._processors.values():
-            processor.process(**kwargs)
+        """Process all registered processors concurrently, as in RegisterManager.process_all"""
+        if not self._processors:
+            return
+        with ThreadPoolExecutor(max_workers=len(self._processors)) as executor:
+            futures = [
+                (executor.submit(processor.process, **kwargs), name) for name, processor in self._processors.items()
+            ]
+
+            for future, name in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error processing {name}: {str(e)}")
+                    raise
 
 
 registry = ProcessorRegistry()
@@ -18,11 +18,11 @@ BEF_SCHEMA = {
     "FM_MARK": pl.Categorical,  # Family mark
     "FOED_DAG": pl.Date,  # Date of birth
     "HUSTYPE": pl.Categorical,  # Household type
-    "IE_TYPE": pl.Utf8,  # Immigration/emigration type
-    "KOEN": pl.Utf8,  # Gender
+    "IE_TYPE": pl.Categorical,  # Immigration/emigration type
+    "KOEN": pl.Categorical,  # Gender
     "KOM": pl.Int16,  # Municipality code
     "MOR_ID": pl.Utf8,  # PNR of the mother
-    "OPR_LAND": pl.Utf8,  # Country of origin
+    "OPR_LAND": pl.Categorical,  # Country of origin
     "PLADS": pl.Categorical,  # The person's place in the family
     "PNR": pl.Utf8,  # CPR/PNR number
     "REG": pl.Categorical,  # Region
@@ -41,15 +41,15 @@ AKM_SCHEMA = {
     "CPRTJEK": pl.Utf8,
     "CPRTYPE": pl.Utf8,
     "VERSION": pl.Utf8,
-    "SENR": pl.Utf8,
+    "SENR": pl.Categorical,
 }
 
 IND_SCHEMA = {
     "BESKST13": pl.Int8,
     "CPRTJEK": pl.Utf8,
     "CPRTYPE": pl.Utf8,
-    "LOENMV_13": pl.Float64,
-    "PERINDKIALT_13": pl.Float64,
+    "LOENMV_13": pl.Float32,
+    "PERINDKIALT_13": pl.Float32,
     "PNR": pl.Utf8,
     "PRE_SOCIO": pl.Int8,
     "VERSION": pl.Utf8,
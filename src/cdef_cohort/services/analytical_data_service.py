@@ -349,16 +349,17 @@ class AnalyticalDataService(ConfigurableService):
             # Calculate static statistics
             logger.info("Calculating static statistics")
             static_data = pl.scan_parquet(self._config.zones["static"] / "individual_attributes.parquet")
-            static_stats = self._calculate_static_statistics(static_data)
-            if not static_stats.collect().is_empty():
-                static_stats.collect().write_parquet(stats_path / "static_statistics.parquet")
+            # Collect each result once and reuse it for the emptiness check and the write
+            static_stats = self._calculate_static_statistics(static_data).collect()
+            if not static_stats.is_empty():
+                static_stats.write_parquet(stats_path / "static_statistics.parquet")
 
             # Calculate family statistics
             logger.info("Calculating family statistics")
             family_data = pl.scan_parquet(self._config.zones["family"] / "family_relationships.parquet")
-            family_stats = self._calculate_family_statistics(family_data)
-            if not family_stats.collect().is_empty():
-                family_stats.collect().write_parquet(stats_path / "family_statistics.parquet")
+            family_stats = self._calculate_family_statistics(family_data).collect()
+            if not family_stats.is_empty():
+                family_stats.write_parquet(stats_path / "family_statistics.parquet")
 
             # Calculate longitudinal statistics
             logger.info("Calculating longitudinal statistics")
@@ -377,10 +378,10 @@ class AnalyticalDataService(ConfigurableService):
                             continue
 
                         domain_data = pl.scan_parquet(domain_path)
-                        domain_stats = self._calculate_domain_statistics(domain, domain_data)
+                        domain_stats = self._calculate_domain_statistics(domain, domain_data).collect()
 
-                        if not domain_stats.collect().is_empty():
-                            domain_stats.collect().write_parquet(
+                        if not domain_stats.is_empty():
+                            domain_stats.write_parquet(
                                 longitudinal_path / f"{domain.name}_statistics.parquet", partition_by="year"
                             )
                     except Exception as e:
@@ -1,3 +1,4 @@
+import logging
 from pathlib import Path
 from typing import Any, TypedDict
 
@@ -5,12 +6,30 @@ import polars as pl
 
 from cdef_cohort.logging_config import logger
 from cdef_cohort.utils.date import parse_dates
+from cdef_cohort.utils.icd import SCD_CODE_PATTERN, icd_description_columns
 
 from .base import ConfigurableService
 from .data_service import DataService
 from .event_service import EventService
 from .mapping_service import MappingService
 
+# Rows per row group in the events file, which is sorted by event type and PNR
+EVENTS_ROW_GROUP_SIZE = 512 * 512
+
+# Harmonized columns used by the SCD algorithm and the analytical health summaries; the
+# combined LPR2/LPR3 health data is projected to these before concatenation
+HEALTH_COLUMNS = [
+    "patient_id",
+    "primary_diagnosis",
+    "diagnosis",
+    "secondary_diagnosis",
+    "admission_date",
+    "discharge_date",
+    "admission_type",
+    "department",
+    "source",
+]
+
 
 class DiagnosisGroup(TypedDict):
     group: str
@@ -58,17 +77,30 @@ class CohortService(ConfigurableService):
         for name, definition in event_definitions.items():
             self.event_service.register_event(name, definition)
         events = self.event_service.identify_events(data)
-        self.data_service.write_parquet(events, output_file)
-        return events
+        # Clustering by event type and person keeps the row group statistics selective
+        # for the per-event-type scans done on the events file. The event definitions use
+        # shift/diff/pct_change, which cannot be streamed, so write_parquet collects the plan.
+        # Without event definitions identify_events returns the data unchanged, with no
+        # event_type column to sort on.
+        if "event_type" in events.collect_schema().names():
+            events = events.sort(["event_type", "PNR"])
+        self.data_service.write_parquet(events, output_file, row_group_size=EVENTS_ROW_GROUP_SIZE)
+        # Re-scan the written file so downstream consumers get parquet pushdown
+        # instead of re-executing the identify_events plan on every collect
+        return self.data_service.read_parquet(output_file)
 
     def identify_severe_chronic_disease(self) -> pl.LazyFrame:
         """Process health data and identify children with severe chronic diseases."""
-        # Count initial population
-        initial_population = self.data_service.read_parquet(self._config["population_file"]).collect().height
+        # Count initial population (only the row count is read, not the data)
+        initial_population = (
+            self.data_service.read_parquet(self._config["population_file"]).select(pl.len()).collect().item()
+        )
         logger.info(f"Initial population size: {initial_population}")
 
         # Process health data
-        self._health_data = self._process_health_data()
+        # Cached so plans that branch over the health data (e.g. the per-group diagnosis
+        # summaries in create_analytical_health_data) only join and harmonize LPR once
+        self._health_data = self._process_health_data().cache()
 
         # Get SCD results
         scd_result = self._get_scd_results(self._health_data)
@@ -85,16 +117,21 @@ class CohortService(ConfigurableService):
         # Analyze results
         summary = {
             "total_patients": final_count,
-            "scd_positive": final_result.filter(pl.col("is_scd")).height,
-            "scd_negative": final_result.filter(~pl.col("is_scd")).height,
-            "has_scd_date": final_result.filter(pl.col("first_scd_date").is_not_null()).height,
+            **final_result.select(
+                [
+                    pl.col("is_scd").sum().alias("scd_positive"),
+                    (~pl.col("is_scd")).sum().alias("scd_negative"),
+                    pl.col("first_scd_date").is_not_null().sum().alias("has_scd_date"),
+                ]
+            ).row(0, named=True),
         }
 
         # Log summary
         for key, value in summary.items():
             logger.info(f"{key}: {value}")
 
-        return scd_result
+        # Hand out the collected result so downstream plans do not re-run the SCD algorithm
+        return final_result.lazy()
 
     def _apply_scd_algorithm(
         self, data: pl.LazyFrame, diagnosis_cols: list[str], date_col: str, id_col: str
@@ -110,289 +147,62 @@ class CohortService(ConfigurableService):
         Returns:
             LazyFrame with SCD flags and dates aggregated at patient level
         """
-        # Log initial count
-        initial_count = data.select(pl.col(id_col)).unique().collect().height
-        logger.info(f"Initial number of unique patients: {initial_count}")
-
         # Input validation
         for col in diagnosis_cols + [date_col, id_col]:
             if col not in data.collect_schema().keys():
                 raise ValueError(f"Required column {col} not found in data")
 
-        # Define SCD codes
-        scd_codes = [
-            "D55",
-            "D56",
-            "D57",
-            "D58",
-            "D60",
-            "D61",
-            "D64",
-            "D66",
-            "D67",
-            "D68",
-            "D69",
-            "D70",
-            "D71",
-            "D72",
-            "D73",
-            "D76",
-            "D80",
-            "D81",
-            "D82",
-            "D83",
-            "D84",
-            "D86",
-            "D89",
-            "E22",
-            "E23",
-            "E24",
-            "E25",
-            "E26",
-            "E27",
-            "E31",
-            "E34",
-            "E70",
-            "E71",
-            "E72",
-            "E73",
-            "E74",
-            "E75",
-            "E76",
-            "E77",
-            "E78",
-            "E79",
-            "E80",
-            "E83",
-            "E84",
-            "E85",
-            "E88",
-            "F84",
-            "G11",
-            "G12",
-            "G13",
-            "G23",
-            "G24",
-            "G25",
-            "G31",
-            "G32",
-            "G36",
-            "G37",
-            "G40",
-            "G41",
-            "G60",
-            "G70",
-            "G71",
-            "G72",
-            "G73",
-            "G80",
-            "G81",
-            "G82",
-            "G83",
-            "G90",
-            "G91",
-            "G93",
-            "I27",
-            "I42",
-            "I43",
-            "I50",
-            "I61",
-            "I63",
-            "I69",
-            "I70",
-            "I71",
-            "I72",
-            "I73",
-            "I74",
-            "I77",
-            "I78",
-            "I79",
-            "J41",
-            "J42",
-            "J43",
-            "J44",
-            "J45",
-            "J47",
-            "J60",
-            "J61",
-            "J62",
-            "J63",
-            "J64",
-            "J65",
-            "J66",
-            "J67",
-            "J68",
-            "J69",
-            "J70",
-            "J84",
-            "J98",
-            "K50",
-            "K51",
-            "K73",
-            "K74",
-            "K86",
-            "K87",
-            "K90",
-            "M05",
-            "M06",
-            "M07",
-            "M08",
-            "M09",
-            "M30",
-            "M31",
-            "M32",
-            "M33",
-            "M34",
-            "M35",
-            "M40",
-            "M41",
-            "M42",
-            "M43",
-            "M45",
-            "M46",
-            "N01",
-            "N03",
-            "N04",
-            "N07",
-            "N08",
-            "N11",
-            "N12",
-            "N13",
-            "N14",
-            "N15",
-            "N16",
-            "N18",
-            "N19",
-            "N20",
-            "N21",
-            "N22",
-            "N23",
-            "N25",
-            "N26",
-            "N27",
-            "N28",
-            "N29",
-            "P27",
-            "Q01",
-            "Q02",
-            "Q03",
-            "Q04",
-            "Q05",
-            "Q06",
-            "Q07",
-            "Q20",
-            "Q21",
-            "Q22",
-            "Q23",
-            "Q24",
-            "Q25",
-            "Q26",
-            "Q27",
-            "Q28",
-            "Q30",
-            "Q31",
-            "Q32",
-            "Q33",
-            "Q34",
-            "Q35",
-            "Q36",
-            "Q37",
-            "Q38",
-            "Q39",
-            "Q40",
-            "Q41",
-            "Q42",
-            "Q43",
-            "Q44",
-            "Q45",
-            "Q60",
-            "Q61",
-            "Q62",
-            "Q63",
-            "Q64",
-            "Q65",
-            "Q66",
-            "Q67",
-            "Q68",
-            "Q69",
-            "Q70",
-            "Q71",
-            "Q72",
-            "Q73",
-            "Q74",
-            "Q75",
-            "Q76",
-            "Q77",
-            "Q78",
-            "Q79",
-            "Q80",
-            "Q81",
-            "Q82",
-            "Q83",
-            "Q84",
-            "Q85",
-            "Q86",
-            "Q87",
-            "Q89",
-            "Q90",
-            "Q91",
-            "Q92",
-            "Q93",
-            "Q95",
-            "Q96",
-            "Q97",
-            "Q98",
-            "Q99",
+        # Match the SCD codes and ranges with a single regex scan per diagnosis column;
+        # NULL diagnoses do not match
+        scd_conditions = [
+            pl.col(diag_col).str.contains(SCD_CODE_PATTERN).fill_null(False) for diag_col in diagnosis_cols
         ]
 
-        # Create SCD conditions with NULL handling
-        scd_conditions = []
-        for diag_col in diagnosis_cols:
-            # Handle NULL values in diagnosis columns
-            safe_diag = pl.col(diag_col).fill_null("").str.to_uppercase()
-
-            scd_condition = (
-                safe_diag.str.slice(1, 4).is_in(scd_codes)
-                | safe_diag.str.slice(1, 5).is_in(scd_codes)
-                | ((safe_diag.str.slice(1, 4) >= pl.lit("E74")) & (safe_diag.str.slice(1, 4) <= pl.lit("E84")))
-                | ((safe_diag.str.slice(1, 5) >= pl.lit("P941")) & (safe_diag.str.slice(1, 5) <= pl.lit("P949")))
-            )
-            scd_conditions.append(scd_condition)
-
         # Combine conditions and create result
         is_scd_expr = pl.any_horizontal(*scd_conditions).fill_null(False)  # Explicitly fill NULLs with False
 
-        # Create intermediate result with validation
-        result = data.with_columns(
+        # Record-level statistics, computed as aggregates instead of materializing every record
+        intermediate_stats = data.select(
             [
-                is_scd_expr.cast(pl.Boolean).alias("is_scd"),  # Explicitly cast to Boolean
-                pl.when(is_scd_expr).then(pl.col(date_col)).otherwise(None).alias("first_scd_date"),
+                pl.len().alias("total_records"),
+                pl.col(id_col).n_unique().alias("unique_patients"),
+                is_scd_expr.sum().alias("scd_records"),
             ]
         )
 
-        # Log intermediate state
-        intermediate = result.collect()
-        logger.info("Intermediate processing state:")
-        logger.info(f"Total records: {intermediate.height}")
-        logger.info(f"Unique patients: {intermediate.select(pl.col(id_col)).unique().height}")
-        logger.info(f"Value counts for is_scd: {intermediate.get_column('is_scd').value_counts()}")
+        # Filter to SCD records before aggregating. The predicate only reads the diagnosis
+        # columns, so it is pushed down towards the scans and the dates and IDs are only
+        # carried along for the few matching records.
+        scd_patients = (
+            data.filter(is_scd_expr)
+            .group_by(id_col)
+            .agg(pl.col(date_col).min().alias("first_scd_date"))
+            .with_columns(pl.lit(True).alias("is_scd"))
+        )
 
-        # Aggregate to patient level with validation
-        aggregated = (
-            result.group_by(id_col)
-            .agg(
+        # Every patient keeps a row; patients without SCD records are marked False
+        aggregated_plan = (
+            data.select(id_col)
+            .unique()
+            .join(scd_patients, on=id_col, how="left")
+            .select(
                 [
-                    pl.col("is_scd")
-                    .cast(pl.Boolean)  # Ensure Boolean type
-                    .max()  # If any record is True, patient is marked as True
-                    .fill_null(False)  # Handle any remaining NULLs
-                    .alias("is_scd"),
-                    pl.col("first_scd_date").min().alias("first_scd_date"),
+                    pl.col(id_col),
+                    pl.col("is_scd").fill_null(False),
+                    pl.col("first_scd_date"),
                 ]
             )
-            .collect()
         )
 
+        # Collect both together so the health data is only scanned and joined once
+        aggregated, stats = pl.collect_all([aggregated_plan, intermediate_stats])
+        stats_row = stats.row(0, named=True)
+        initial_count = stats_row["unique_patients"]
+        logger.info(f"Initial number of unique patients: {initial_count}")
+        logger.info("Intermediate processing state:")
+        logger.info(f"Total records: {stats_row['total_records']}")
+        logger.info(f"SCD records: {stats_row['scd_records']}")
+
         # Final validation
         final_count = aggregated.height
         if final_count != initial_count:
@@ -417,29 +227,14 @@ class CohortService(ConfigurableService):
         Returns:
             LazyFrame with added ICD-10 descriptions
         """
-        icd_descriptions = pl.scan_csv(icd_file)
+        # The descriptions file is small, so parse it once and gather from it instead of joining
+        icd_descriptions = pl.read_csv(icd_file)
 
-        return (
-            df.with_columns(
-                [
-                    pl.col("C_ADIAG").str.slice(1).alias("icd_code_adiag"),
-                    pl.col("C_DIAG").str.slice(1).alias("icd_code_diag"),
-                ]
-            )
-            .join(
-                icd_descriptions,
-                left_on="icd_code_adiag",
-                right_on="icd10",
-                how="left",
-            )
-            .join(
-                icd_descriptions,
-                left_on="icd_code_diag",
-                right_on="icd10",
-                how="left",
-                suffix="_diag",
-            )
-            .drop(["icd_code_adiag", "icd_code_diag"])
+        return df.with_columns(
+            [
+                *icd_description_columns(pl.col("C_ADIAG").str.slice(1), icd_descriptions),
+                *icd_description_columns(pl.col("C_DIAG").str.slice(1), icd_descriptions, suffix="_diag"),
+            ]
         )
 
     def _process_health_data(self) -> pl.LazyFrame:
@@ -471,20 +266,21 @@ class CohortService(ConfigurableService):
         """Combine harmonized LPR2 and LPR3 data."""
         logger.debug("Starting combination of harmonized data")
 
-        all_columns = set(df1.collect_schema().names()).union(set(df2.collect_schema().names()))
+        df1_columns = set(df1.collect_schema().names())
+        df2_columns = set(df2.collect_schema().names())
 
-        for col in all_columns:
-            if col not in df1.collect_schema().names():
-                df1 = df1.with_columns(pl.lit(None).cast(pl.Utf8).alias(col))
-            else:
-                df1 = df1.with_columns(pl.col(col).cast(pl.Utf8))
-
-            if col not in df2.collect_schema().names():
-                df2 = df2.with_columns(pl.lit(None).cast(pl.Utf8).alias(col))
-            else:
-                df2 = df2.with_columns(pl.col(col).cast(pl.Utf8))
+        # Project both sides to the shared set of used columns instead of padding the union of
+        # every LPR2 and LPR3 column with nulls
+        def align(df: pl.LazyFrame, columns: set[str]) -> pl.LazyFrame:
+            return df.select(
+                [
+                    pl.col(col).cast(pl.Utf8) if col in columns else pl.lit(None).cast(pl.Utf8).alias(col)
+                    for col in HEALTH_COLUMNS
+                ]
+            )
 
-        combined_df = pl.concat([df1.select(sorted(all_columns)), df2.select(sorted(all_columns))])
+        # Both sides share an all-Utf8 schema, so skip the rechunk copy of the combined table
+        combined_df = pl.concat([align(df1, df1_columns), align(df2, df2_columns)], rechunk=False)
 
         # Parse dates and ensure department handling
         combined_df = combined_df.with_columns(
@@ -498,30 +294,43 @@ class CohortService(ConfigurableService):
     ) -> pl.LazyFrame:
         """Integrate LPR2 components: adm, diag, and bes."""
         logger.debug("Starting LPR2 component integration")
-        logger.debug(f"LPR2 ADM schema: {lpr_adm.collect_schema()}")
-        logger.debug(f"LPR2 DIAG schema: {lpr_diag.collect_schema()}")
-        logger.debug(f"LPR2 BES schema: {lpr_bes.collect_schema()}")
-
+        # Resolving a schema runs the optimizer, so only do it when debug output is kept
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"LPR2 ADM schema: {lpr_adm.collect_schema()}")
+            logger.debug(f"LPR2 DIAG schema: {lpr_diag.collect_schema()}")
+            logger.debug(f"LPR2 BES schema: {lpr_bes.collect_schema()}")
+
+        # Join on categorical record numbers, so the joins hash the integer codes under the
+        # global string cache held by the DataService instead of the strings themselves
+        lpr_adm, lpr_diag, lpr_bes = (
+            df.with_columns(pl.col("RECNUM").cast(pl.Categorical)) for df in (lpr_adm, lpr_diag, lpr_bes)
+        )
         lpr2_integrated = (
             lpr_adm.join(lpr_diag, on="RECNUM", how="left")
             .join(lpr_bes, on="RECNUM", how="left")
             .with_columns([pl.coalesce(pl.col("C_AFD"), pl.lit("Unknown")).alias("department_code")])
         )
 
-        logger.debug(f"LPR2 final integrated schema: {lpr2_integrated.collect_schema()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"LPR2 final integrated schema: {lpr2_integrated.collect_schema()}")
         return lpr2_integrated
 
     def _integrate_lpr3_components(self, lpr3_kontakter: pl.LazyFrame, lpr3_diagnoser: pl.LazyFrame) -> pl.LazyFrame:
         """Integrate LPR3 components: kontakter and diagnoser."""
         logger.debug("Starting LPR3 component integration")
-        logger.debug(f"LPR3 kontakter schema: {lpr3_kontakter.collect_schema()}")
-        logger.debug(f"LPR3 diagnoser schema: {lpr3_diagnoser.collect_schema()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"LPR3 kontakter schema: {lpr3_kontakter.collect_schema()}")
+            logger.debug(f"LPR3 diagnoser schema: {lpr3_diagnoser.collect_schema()}")
 
+        lpr3_kontakter, lpr3_diagnoser = (
+            df.with_columns(pl.col("DW_EK_KONTAKT").cast(pl.Categorical)) for df in (lpr3_kontakter, lpr3_diagnoser)
+        )
         lpr3_integrated = lpr3_kontakter.join(lpr3_diagnoser, on="DW_EK_KONTAKT", how="left").with_columns(
             [pl.coalesce(pl.col("SORENHED_ANS"), pl.lit("Unknown")).alias("department_code")]
         )
 
-        logger.debug(f"LPR3 integrated schema: {lpr3_integrated.collect_schema()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"LPR3 integrated schema: {lpr3_integrated.collect_schema()}")
         return lpr3_integrated
 
     def _harmonize_health_data(self, df1: pl.LazyFrame, df2: pl.LazyFrame) -> tuple[pl.LazyFrame, pl.LazyFrame]:
@@ -569,19 +378,13 @@ class CohortService(ConfigurableService):
         }
 
         def rename_columns(df: pl.LazyFrame) -> pl.LazyFrame:
-            # Create a copy of the DataFrame with all columns
-            result = df
-
-            # First, ensure we rename department_code to department
-            if "department_code" in result.collect_schema().names():
-                result = result.rename({"department_code": "department"})
-
-            # Then handle all other column renames
-            for old_name, new_name in column_mappings.items():
-                if old_name in result.collect_schema().names() and old_name != "department_code":
-                    result = result.rename({old_name: new_name})
-
-            return result
+            # Resolve the schema once and apply all renames in a single step;
+            # department_code becomes department, so C_AFD can take its place
+            names = set(df.collect_schema().names())
+            renames = {old: new for old, new in column_mappings.items() if old in names}
+            if "department_code" in names:
+                renames["department_code"] = "department"
+            return df.rename(renames)
 
         # Apply renaming and add source
         df1_harmonized = rename_columns(df1).with_columns(
@@ -592,8 +395,9 @@ class CohortService(ConfigurableService):
             [pl.lit("LPR3").alias("source"), pl.col("department").fill_null("Unknown")]
         )
 
-        logger.debug(f"Harmonized LPR2 schema: {df1_harmonized.collect_schema()}")
-        logger.debug(f"Harmonized LPR3 schema: {df2_harmonized.collect_schema()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Harmonized LPR2 schema: {df1_harmonized.collect_schema()}")
+            logger.debug(f"Harmonized LPR3 schema: {df2_harmonized.collect_schema()}")
 
         return df1_harmonized, df2_harmonized
 
@@ -603,17 +407,8 @@ class CohortService(ConfigurableService):
             health_data, ["primary_diagnosis", "diagnosis", "secondary_diagnosis"], "admission_date", "patient_id"
         )
 
-        return (
-            scd_result.group_by("patient_id")
-            .agg(
-                [
-                    pl.col("is_scd").max().alias("is_scd"),
-                    pl.col("first_scd_date").min().alias("first_scd_date"),
-                ]
-            )
-            .with_columns([pl.col("patient_id").alias("PNR")])
-            .drop("patient_id")
-        )
+        # _apply_scd_algorithm already aggregates to one row per patient
+        return scd_result.rename({"patient_id": "PNR"})
 
     def get_health_data_for_analytical(self) -> pl.LazyFrame | None:
         """Get processed health data for analytical dataset."""
@@ -706,7 +501,7 @@ class CohortService(ConfigurableService):
 
                 accumulated_metrics.append(group_metrics)
 
-            # Combine all metrics using a series of joins
+            # Combine all metrics in one lazy join chain, filling the missing counts once at the end
             final_summary = base_summary
             for metrics in accumulated_metrics:
                 final_summary = final_summary.join(
@@ -719,11 +514,8 @@ class CohortService(ConfigurableService):
                     ),
                     on=["PNR", "year"],
                     how="left",
-                ).with_columns(
-                    [
-                        pl.col("^num_.*$").fill_null(0)  # Fill nulls in all numeric columns
-                    ]
                 )
+            final_summary = final_summary.with_columns(pl.col("^num_.*$").fill_null(0))
 
             # Write diagnosis group summaries
             self.data_service.write_parquet(
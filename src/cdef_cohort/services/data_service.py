@@ -1,10 +1,28 @@
 from pathlib import Path
+from typing import Any
 
 import polars as pl
 
 from .base import BaseService
 
 
+def sink_parquet(df: pl.LazyFrame, path: Path | str, **kwargs: Any) -> None:
+    """Stream a LazyFrame to a parquet file, collecting it first if it cannot be streamed.
+
+    The streaming engine does not support every plan (e.g. shift/diff, window expressions,
+    cached subplans and right joins); those plans are collected and written instead.
+
+    Args:
+        df: LazyFrame to write
+        path: Output path
+        **kwargs: Write options accepted by both sink_parquet and write_parquet
+    """
+    try:
+        df.sink_parquet(path, **kwargs)
+    except pl.exceptions.InvalidOperationError:
+        df.collect().write_parquet(path, **kwargs)
+
+
 class DataService(BaseService):
     def __init__(self):
         self._cache = {}
@@ -25,24 +43,55 @@ class DataService(BaseService):
         return True
 
     def read_parquet(self, path: Path) -> pl.LazyFrame:
-        """Read parquet file(s) into LazyFrame"""
-        return pl.scan_parquet(path)
+        """Read parquet file(s) into LazyFrame.
+
+        The files are scanned with ``parallel="prefiltered"``: when the plan filters the
+        data, the filter columns are decoded first and the remaining columns only for the
+        rows that pass.
+        """
+        return pl.scan_parquet(path, parallel="prefiltered")
 
     def write_parquet(
         self,
         df: pl.LazyFrame,
         path: Path,
         partition_by: str | list[str] | None = None,
+        row_group_size: int | None = None,
     ) -> None:
         """Write LazyFrame to parquet file with optional partitioning.
 
+        Unpartitioned output is streamed to disk with `sink_parquet` where the plan
+        allows it, so only a batch at a time is held in memory. Partitioned output
+        still needs the collected frame.
+
         Args:
             df: LazyFrame to write
             path: Output path
             partition_by: Column(s) to partition by
+            row_group_size: Rows per row group, or None for the Polars default
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if partition_by is None:
+            sink_parquet(df, path, compression="zstd", row_group_size=row_group_size)
+        else:
+            df.collect().write_parquet(
+                path, compression="zstd", row_group_size=row_group_size, partition_by=partition_by
+            )
+
+    def write_ipc(self, df: pl.LazyFrame, path: Path) -> None:
+        """Write LazyFrame to an uncompressed Arrow IPC file.
+
+        Uncompressed IPC files can be memory-mapped when scanned, so small tables that
+        are read many times (such as the population) skip parquet decoding.
         """
+        path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        df.collect().write_parquet(path, compression="snappy", partition_by=partition_by)
+        # Same fallback as sink_parquet for plans the streaming engine cannot run
+        try:
+            df.sink_ipc(path, compression=None)
+        except pl.exceptions.InvalidOperationError:
+            df.collect().write_ipc(path, compression=None)
 
     def validate_schema(self, df: pl.LazyFrame, expected_schema: dict) -> bool:
         """Validate DataFrame schema matches expected schema"""
@@ -12,6 +12,7 @@ from .base import ConfigurableService
 class MappingService(ConfigurableService):
     def __init__(self, mapping_dir: Path):
         self._mappings: dict[str, dict[str, Any]] = {}
+        self._lookups: dict[str, tuple[pl.Series, pl.Series]] = {}
         self._mapping_dir = mapping_dir
         self._isced_map: dict[str, str] | None = None
 
@@ -30,6 +31,7 @@ class MappingService(ConfigurableService):
     def shutdown(self) -> None:
         """Clean up service resources"""
         self._mappings.clear()
+        self._lookups.clear()
         self._isced_map = None
 
     def check_valid(self) -> bool:
@@ -57,16 +59,8 @@ class MappingService(ConfigurableService):
             logger.warning("ISCED mapping not loaded - returning original DataFrame")
             return df
 
-        isced_map = self._isced_map  # Create local reference
-
-        return df.with_columns(
-            [
-                pl.when(pl.col(column).is_not_null())
-                .then(pl.col(column).map_elements(lambda x: isced_map.get(str(x), x) if isced_map else x))
-                .otherwise(None)
-                .alias("EDU_LVL")
-            ]
-        )
+        # Vectorized lookup; unmapped codes are kept as-is and nulls stay null
+        return df.with_columns([pl.col(column).cast(pl.Utf8).replace(self._isced_map).alias("EDU_LVL")])
 
     def apply_mapping(
         self, col: pl.Expr, mapping_name: str, return_dtype: type[pl.DataType] = pl.Categorical
@@ -74,8 +68,9 @@ class MappingService(ConfigurableService):
         """Apply a named mapping to a column"""
         if mapping_name not in self._mappings:
             self.load_mapping(mapping_name)
-        mapping = self._mappings[mapping_name]
-        return col.map_elements(lambda x: mapping.get(str(x), x), return_dtype=return_dtype)
+        # Vectorized lookup against the prebuilt Series; unmapped codes are kept as-is
+        old, new = self._lookups[mapping_name]
+        return col.cast(pl.Utf8).replace(old, new).cast(return_dtype)
 
     def load_mapping(self, mapping_name: str) -> None:
         """Load mapping from JSON file"""
@@ -84,4 +79,10 @@ class MappingService(ConfigurableService):
             raise FileNotFoundError(f"Mapping file not found: {mapping_file}")
 
         with open(mapping_file) as f:
-            self._mappings[mapping_name] = json.load(f)
+            mapping = json.load(f)
+        self._mappings[mapping_name] = mapping
+        # Build the lookup Series once per mapping rather than converting the dict on every call
+        self._lookups[mapping_name] = (
+            pl.Series(list(mapping.keys()), dtype=pl.Utf8),
+            pl.Series([None if v is None else str(v) for v in mapping.values()], dtype=pl.Utf8),
+        )
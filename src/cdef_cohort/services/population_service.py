@@ -4,7 +4,7 @@ from typing import Any
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.utils.date import parse_dates
+from cdef_cohort.utils.date import parse_dates, parse_dates_sampled
 
 from .base import ConfigurableService
 from .data_service import DataService
@@ -41,20 +41,13 @@ class PopulationService(ConfigurableService):
         """Read BEF data and return a LazyFrame with standardized columns."""
         logger.info(f"Reading BEF data from: {self._config['bef_files']}")
 
-        return (
-            pl.read_parquet(
-                self._config["bef_files"],
-                columns=["PNR", "FAR_ID", "MOR_ID", "FAMILIE_ID", "FOED_DAG"],
-                schema={
-                    "PNR": pl.Utf8,
-                    "FAR_ID": pl.Utf8,
-                    "MOR_ID": pl.Utf8,
-                    "FAMILIE_ID": pl.Utf8,
-                    "FOED_DAG": pl.Utf8,
-                },
-            )
-            .lazy()
-            .with_columns([parse_dates("FOED_DAG")])
+        # Scan lazily instead of reading all BEF files into memory up front; the select is
+        # pushed into the scan, so only these columns are read
+        bef = pl.scan_parquet(self._config["bef_files"], parallel="prefiltered").select(
+            [pl.col(col).cast(pl.Utf8) for col in ["PNR", "FAR_ID", "MOR_ID", "FAMILIE_ID", "FOED_DAG"]]
+        )
+        return bef.with_columns(
+            parse_dates_sampled(bef, ["FOED_DAG"], source=self._config["bef_files"])
         )
 
     def read_mfr_data(self) -> pl.LazyFrame | None:
@@ -69,17 +62,8 @@ class PopulationService(ConfigurableService):
                 return None
 
             return (
-                pl.read_parquet(
-                    self._config["mfr_files"],
-                    columns=["CPR_BARN", "CPR_FADER", "CPR_MODER", "FOEDSELSDATO"],
-                    schema={
-                        "CPR_BARN": pl.Utf8,
-                        "CPR_FADER": pl.Utf8,
-                        "CPR_MODER": pl.Utf8,
-                        "FOEDSELSDATO": pl.Utf8,
-                    },
-                )
-                .lazy()
+                pl.scan_parquet(self._config["mfr_files"], parallel="prefiltered")
+                .select([pl.col(col).cast(pl.Utf8) for col in ["CPR_BARN", "CPR_FADER", "CPR_MODER", "FOEDSELSDATO"]])
                 .with_columns([parse_dates("FOEDSELSDATO")])
                 .select(
                     [
@@ -1,4 +1,3 @@
-import re
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +9,7 @@ from cdef_cohort.services.base import ConfigurableService
 from cdef_cohort.services.config_service import ConfigService
 from cdef_cohort.services.data_service import DataService
 from cdef_cohort.services.mapping_service import MappingService
+from cdef_cohort.utils.date import extract_date_from_filename
 
 
 class RegisterService(ConfigurableService):
@@ -84,7 +84,7 @@ class RegisterService(ConfigurableService):
         data_frames = []
         for file in files:
             try:
-                df = pl.scan_parquet(file, allow_missing_columns=True)
+                df = pl.scan_parquet(file, allow_missing_columns=True, parallel="prefiltered")
                 date_info = self.extract_date_from_filename(file.stem)
 
                 if "year" in date_info:
@@ -107,29 +107,13 @@ class RegisterService(ConfigurableService):
         if not data_frames:
             raise ValueError("No valid data frames to process")
 
-        return pl.concat(data_frames)
+        # Files may differ in columns (e.g. monthly vs yearly files); downstream
+        # group_bys do not need contiguous chunks, so skip the rechunk copy
+        return pl.concat(data_frames, how="diagonal_relaxed", rechunk=False)
 
     def extract_date_from_filename(self, filename: str) -> dict[str, int]:
         """Extract year and month (if present) from a filename."""
-        logger.debug(f"Attempting to extract date from filename: {filename}")
-
-        # Try to match YYYYMM format first
-        match = re.search(r"(\d{4})(\d{2})", filename)
-        if match:
-            result = {"year": int(match.group(1)), "month": int(match.group(2))}
-            logger.debug(f"Extracted year and month: {result}")
-            return result
-
-        # If not, try to match just YYYY
-        match = re.search(r"(\d{4})", filename)
-        if match:
-            result = {"year": int(match.group(1))}
-            logger.debug(f"Extracted year only: {result}")
-            return result
-
-        # If no match found, return an empty dict
-        logger.debug("No date information found in filename")
-        return {}
+        return extract_date_from_filename(filename)
 
     def validate_and_select_columns(
         self, df: pl.LazyFrame, columns: list[str], select_columns: bool = True
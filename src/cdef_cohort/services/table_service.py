@@ -55,14 +55,17 @@ class TableService(ConfigurableService):
         stats_base_path = Path(self._config["analytical_data_path"]) / "derived" / "statistics"
 
         try:
+            # List the longitudinal statistics once instead of stat-ing each yearly file
+            available = self._list_available_files(stats_base_path / "longitudinal")
+
             # 1. CHILD CHARACTERISTICS
             self._add_child_characteristics(stats_base_path, results, stratify_by)
 
             # 2. MATERNAL CHARACTERISTICS
-            self._add_maternal_characteristics(stats_base_path, results, stratify_by)
+            self._add_maternal_characteristics(stats_base_path, results, stratify_by, available)
 
             # 3. PATERNAL CHARACTERISTICS
-            self._add_paternal_characteristics(stats_base_path, results, stratify_by)
+            self._add_paternal_characteristics(stats_base_path, results, stratify_by, available)
 
             # 4. FAMILY CHARACTERISTICS
             self._add_family_characteristics(stats_base_path, results, stratify_by)
@@ -114,7 +117,13 @@ class TableService(ConfigurableService):
 
         return stats.filter(pl.col("stratification") == stratify_by)
 
-    def _add_maternal_characteristics(self, stats_path: Path, results: list, stratify_by: str | None = None) -> None:
+    def _add_maternal_characteristics(
+        self,
+        stats_path: Path,
+        results: list,
+        stratify_by: str | None = None,
+        available: frozenset[str] | None = None,
+    ) -> None:
         """Add maternal characteristics section"""
         # Add maternal age
         family_stats = pl.scan_parquet(stats_path / "family_statistics.parquet")
@@ -124,7 +133,9 @@ class TableService(ConfigurableService):
 
         # Add longitudinal characteristics
         for year in self._config["study_years"]:
-            longitudinal_stats = pl.scan_parquet(stats_path / "longitudinal" / f"mother_characteristics_{year}.parquet")
+            longitudinal_stats = self._scan_yearly_statistics(
+                stats_path / "longitudinal" / f"mother_characteristics_{year}.parquet", available
+            )
 
             # Education
             self._add_categorical_stat_with_category(
@@ -156,7 +167,13 @@ class TableService(ConfigurableService):
                 year=year,
             )
 
-    def _add_paternal_characteristics(self, stats_path: Path, results: list, stratify_by: str | None = None) -> None:
+    def _add_paternal_characteristics(
+        self,
+        stats_path: Path,
+        results: list,
+        stratify_by: str | None = None,
+        available: frozenset[str] | None = None,
+    ) -> None:
         """Add paternal characteristics section"""
         # Add paternal age
         family_stats = pl.scan_parquet(stats_path / "family_statistics.parquet")
@@ -166,7 +183,9 @@ class TableService(ConfigurableService):
 
         # Add longitudinal characteristics
         for year in self._config["study_years"]:
-            longitudinal_stats = pl.scan_parquet(stats_path / "longitudinal" / f"father_characteristics_{year}.parquet")
+            longitudinal_stats = self._scan_yearly_statistics(
+                stats_path / "longitudinal" / f"father_characteristics_{year}.parquet", available
+            )
 
             # Education
             self._add_categorical_stat_with_category(
@@ -415,6 +434,28 @@ class TableService(ConfigurableService):
             "csv": df,
         }
 
+    def _list_available_files(self, directory: Path) -> frozenset[str]:
+        """List the file names in a directory once, for repeated membership checks"""
+        if not directory.is_dir():
+            return frozenset()
+        return frozenset(p.name for p in directory.iterdir())
+
+    def _scan_yearly_statistics(self, file_path: Path, available: frozenset[str] | None = None) -> pl.LazyFrame:
+        """Scan a yearly statistics file, which every study year must have
+
+        Args:
+            file_path: Path to the parquet file
+            available: Pre-listed file names in the parent directory. When given, existence is
+                checked against this set instead of stat-ing the file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        exists = file_path.name in available if available is not None else file_path.exists()
+        if not exists:
+            raise FileNotFoundError(f"Statistics file not found: {file_path}")
+        return pl.scan_parquet(file_path)
+
     def _safe_scan_parquet(self, file_path: Path) -> pl.LazyFrame | None:
         """Safely scan a parquet file with error handling"""
         try:
@@ -30,11 +30,12 @@ class Settings(BaseSettings):
         "number_of_children_decrease": (pl.col("ANTBOERNH").cast(pl.Int64).diff() < 0),
     }
 
+    # PERINDKIALT_13 is written as Float32 by the IND register, so the income events use it as is
     FATHER_EVENT_DEFINITIONS: dict[str, Any] = {
         "father_education_change": (pl.col("FAR_EDU_LVL").shift() != pl.col("FAR_EDU_LVL")),
-        "father_income_change": (pl.col("FAR_PERINDKIALT_13").cast(pl.Float64).diff() != 0),
-        "significant_income_increase_father": (pl.col("FAR_PERINDKIALT_13").cast(pl.Float64).pct_change() > 0.10),
-        "significant_income_decrease_father": (pl.col("FAR_PERINDKIALT_13").cast(pl.Float64).pct_change() < -0.10),
+        "father_income_change": (pl.col("FAR_PERINDKIALT_13").diff() != 0),
+        "significant_income_increase_father": (pl.col("FAR_PERINDKIALT_13").pct_change() > 0.10),
+        "significant_income_decrease_father": (pl.col("FAR_PERINDKIALT_13").pct_change() < -0.10),
         "father_employment_status_change": (pl.col("FAR_BESKST13").shift() != pl.col("FAR_BESKST13")),
         "father_job_change": (pl.col("FAR_STILL").shift() != pl.col("FAR_STILL")),
         "father_socioeconomic_status_change": (pl.col("FAR_SOCIO13").shift() != pl.col("FAR_SOCIO13")),
@@ -42,9 +43,9 @@ class Settings(BaseSettings):
 
     MOTHER_EVENT_DEFINITIONS: dict[str, Any] = {
         "mother_education_change": (pl.col("MOR_EDU_LVL").shift() != pl.col("MOR_EDU_LVL")),
-        "mother_income_change": (pl.col("MOR_PERINDKIALT_13").cast(pl.Float64).diff() != 0),
-        "significant_income_increase_mother": (pl.col("MOR_PERINDKIALT_13").cast(pl.Float64).pct_change() > 0.10),
-        "significant_income_decrease_mother": (pl.col("MOR_PERINDKIALT_13").cast(pl.Float64).pct_change() < -0.10),
+        "mother_income_change": (pl.col("MOR_PERINDKIALT_13").diff() != 0),
+        "significant_income_increase_mother": (pl.col("MOR_PERINDKIALT_13").pct_change() > 0.10),
+        "significant_income_decrease_mother": (pl.col("MOR_PERINDKIALT_13").pct_change() < -0.10),
         "mother_employment_status_change": (pl.col("MOR_BESKST13").shift() != pl.col("MOR_BESKST13")),
         "mother_job_change": (pl.col("MOR_STILL").shift() != pl.col("MOR_STILL")),
         "mother_socioeconomic_status_change": (pl.col("MOR_SOCIO13").shift() != pl.col("MOR_SOCIO13")),
@@ -68,6 +69,11 @@ class Settings(BaseSettings):
     def POPULATION_FILE(self) -> Path:
         return self.DATA_DIR / "population.parquet"
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def POPULATION_IPC_FILE(self) -> Path:
+        return self.POPULATION_FILE.with_suffix(".arrow")
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def STATIC_COHORT(self) -> Path:
@@ -93,6 +99,11 @@ class Settings(BaseSettings):
     def ICD_FILE(self) -> Path:
         return self.DATA_DIR / "icd10dict.csv"
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def ICD_PARQUET_FILE(self) -> Path:
+        return self.DATA_DIR / "icd10dict.parquet"
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def BEF_FILES(self) -> Path:
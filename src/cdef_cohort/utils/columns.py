@@ -62,7 +62,7 @@ def validate_and_select_columns(
     if select_columns:
         logger.debug("Selecting columns from LazyFrame")
         selected_data = data.select(valid_columns)
-        logger.debug(f"Selected data schema: {selected_data.collect_schema()}")
+        logger.debug(f"Selected columns: {valid_columns}")
         return valid_columns, selected_data
     else:
         logger.debug("Returning original LazyFrame without selection")
@@ -9,6 +9,7 @@ COHORT_FILE = settings.COHORT_FILE
 HASH_FILE_PATH = settings.HASH_FILE_PATH
 ISCED_FILE = settings.ISCED_FILE
 ICD_FILE = settings.ICD_FILE
+ICD_PARQUET_FILE = settings.ICD_PARQUET_FILE
 ISCED_MAPPING_FILE = settings.ISCED_MAPPING_FILE
 PARQUETS = settings.PARQUETS
 BIRTH_INCLUSION_START_YEAR = settings.BIRTH_INCLUSION_START_YEAR
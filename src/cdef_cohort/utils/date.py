@@ -1,10 +1,32 @@
 import re
+from functools import cache
+from pathlib import Path
 
 import polars as pl
 
 from cdef_cohort.logging_config import logger
 
-
+# Date formats tried by parse_dates, in order of priority
+DATE_FORMATS = (
+    # Prioritize formats with '/' separator
+    "%Y/%m/%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%Y/%m/%d %H:%M:%S",
+    "%m/%d/%y",
+    # LPR3 format for dates
+    "%d%b%Y",
+    # Then formats with '-' separator
+    "%Y-%m-%d",
+    "%d-%m-%Y",
+    "%m-%d-%Y",
+    "%Y-%m-%d %H:%M:%S",
+    # Locale's appropriate date and time representation
+    "%c",
+)
+
+
+@cache
 def parse_dates(col_name: str) -> pl.Expr:
     """
     Attempt to parse dates from a given column using various date formats.
@@ -20,32 +42,115 @@ def parse_dates(col_name: str) -> pl.Expr:
 
     Note:
         The function uses coalesce to try different date formats in a specific order.
-        It logs debug information about the parsing process.
+        The expression is cached per column name, so repeated calls reuse it; the debug
+        messages are therefore only logged the first time a column is parsed.
     """
     logger.debug(f"Attempting to parse dates for column: {col_name}")
 
-    parsed = pl.coalesce(
-        # Prioritize formats with '/' separator
-        pl.col(col_name).str.strptime(pl.Date, "%Y/%m/%d", strict=False),
-        pl.col(col_name).str.strptime(pl.Date, "%d/%m/%Y", strict=False),
-        pl.col(col_name).str.strptime(pl.Date, "%m/%d/%Y", strict=False),
-        pl.col(col_name).str.strptime(pl.Date, "%Y/%m/%d %H:%M:%S", strict=False),
-        pl.col(col_name).str.strptime(pl.Date, "%m/%d/%y", strict=False),
-        # LPR3 format for dates
-        pl.col(col_name).str.strptime(pl.Date, "%d%b%Y", strict=False),
-        # Then formats with '-' separator
-        pl.col(col_name).str.strptime(pl.Date, "%Y-%m-%d", strict=False),
-        pl.col(col_name).str.strptime(pl.Date, "%d-%m-%Y", strict=False),
-        pl.col(col_name).str.strptime(pl.Date, "%m-%d-%Y", strict=False),
-        pl.col(col_name).str.strptime(pl.Date, "%Y-%m-%d %H:%M:%S", strict=False),
-        # Locale's appropriate date and time representation
-        pl.col(col_name).str.strptime(pl.Date, "%c", strict=False),
-    )
+    parsed = pl.coalesce([pl.col(col_name).str.strptime(pl.Date, fmt, strict=False) for fmt in DATE_FORMATS])
 
     logger.debug(f"Finished parsing dates for column: {col_name}")
     return parsed
 
 
+def detect_date_format(values: pl.Series) -> str | None:
+    """
+    Find the first format in DATE_FORMATS that parses every non-null value in a sample.
+
+    Args:
+        values (pl.Series): Sample of date strings.
+
+    Returns:
+        str | None: The detected format, or None if no single format parses the whole sample.
+    """
+    values = values.drop_nulls()
+    if values.is_empty():
+        return None
+    for fmt in DATE_FORMATS:
+        if values.str.strptime(pl.Date, fmt, strict=False).null_count() == 0:
+            return fmt
+    return None
+
+
+def sample_files(source: Path | str, col_names: list[str], rows_per_file: int) -> pl.DataFrame:
+    """
+    Sample the first rows of every parquet file matching a path or glob pattern.
+
+    Args:
+        source (Path | str): A parquet file or a glob pattern matching parquet files.
+        col_names (list[str]): Names of the columns to sample, cast to strings.
+        rows_per_file (int): Number of rows to take from each file.
+
+    Returns:
+        pl.DataFrame: The sampled rows. Columns missing from a file are null for its rows.
+    """
+    pattern = Path(source)
+    files = sorted(pattern.parent.glob(pattern.name))
+    samples = []
+    for file in files:
+        file_columns = pl.read_parquet_schema(file)
+        samples.append(
+            pl.scan_parquet(file)
+            .select([pl.col(col).cast(pl.Utf8) for col in col_names if col in file_columns])
+            .head(rows_per_file)
+            .collect()
+        )
+    if not samples:
+        return pl.DataFrame(schema={col: pl.Utf8 for col in col_names})
+    sample = pl.concat(samples, how="diagonal_relaxed")
+    return sample.with_columns(
+        [pl.lit(None, dtype=pl.Utf8).alias(col) for col in col_names if col not in sample.columns]
+    )
+
+
+def parse_dates_sampled(
+    df: pl.LazyFrame,
+    col_names: list[str],
+    source: Path | str | None = None,
+    sample_size: int = 256,
+) -> list[pl.Expr]:
+    """
+    Build date parsing expressions, using a single format per column where possible.
+
+    The data is sampled (the first rows of every file when source is given, otherwise the
+    first rows of df). When one format parses every sampled value of a column, the column is
+    parsed with that format, and only values it fails to parse (e.g. from an unsampled file in
+    another format) fall back to parse_dates, so no dates are lost.
+
+    Args:
+        df (pl.LazyFrame): The data the expressions will be applied to.
+        col_names (list[str]): Names of the string columns to parse.
+        source (Path | str | None): The parquet file or glob pattern df was scanned from.
+        sample_size (int): Number of rows to sample from each file, or from df.
+
+    Returns:
+        list[pl.Expr]: One date expression per column, keeping the column names.
+    """
+    if not col_names:
+        return []
+    if source is None:
+        sample = df.select([pl.col(col).cast(pl.Utf8) for col in col_names]).head(sample_size).collect()
+    else:
+        sample = sample_files(source, col_names, sample_size)
+
+    exprs = []
+    for col in col_names:
+        fmt = detect_date_format(sample.get_column(col))
+        if fmt is None:
+            logger.debug(f"No single date format detected for column {col}, trying all formats")
+            exprs.append(parse_dates(col).alias(col))
+        else:
+            logger.debug(f"Detected date format {fmt} for column {col}")
+            parsed = pl.col(col).str.strptime(pl.Date, fmt, strict=False)
+            exprs.append(
+                pl.when(parsed.is_null() & pl.col(col).is_not_null())
+                .then(parse_dates(col))
+                .otherwise(parsed)
+                .alias(col)
+            )
+    return exprs
+
+
 def extract_date_from_filename(filename: str) -> dict[str, int]:
     """
     Extract year and month (if present) from a filename.
@@ -1,3 +1,5 @@
+import logging
+
 import polars as pl
 
 from cdef_cohort.logging_config import logger
@@ -19,15 +21,19 @@ def integrate_lpr2_components(
         pl.LazyFrame: Integrated LPR2 data.
     """
     logger.debug("Starting LPR2 component integration")
-    logger.debug(f"LPR2 ADM schema: {lpr_adm.collect_schema()}")
-    logger.debug(f"LPR2 DIAG schema: {lpr_diag.collect_schema()}")
-    logger.debug(f"LPR2 BES schema: {lpr_bes.collect_schema()}")
+    # Resolving a schema runs the optimizer, so only do it when debug output is kept
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"LPR2 ADM schema: {lpr_adm.collect_schema()}")
+        logger.debug(f"LPR2 DIAG schema: {lpr_diag.collect_schema()}")
+        logger.debug(f"LPR2 BES schema: {lpr_bes.collect_schema()}")
 
     lpr2_integrated = lpr_adm.join(lpr_diag, left_on="RECNUM", right_on="RECNUM", how="left")
-    logger.debug(f"LPR2 ADM-DIAG joined schema: {lpr2_integrated.collect_schema()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"LPR2 ADM-DIAG joined schema: {lpr2_integrated.collect_schema()}")
 
     lpr2_integrated = lpr2_integrated.join(lpr_bes, left_on="RECNUM", right_on="RECNUM", how="left")
-    logger.debug(f"LPR2 final integrated schema: {lpr2_integrated.collect_schema()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"LPR2 final integrated schema: {lpr2_integrated.collect_schema()}")
 
     return lpr2_integrated
 
@@ -46,13 +52,15 @@ def integrate_lpr3_components(
         pl.LazyFrame: Integrated LPR3 data.
     """
     logger.debug("Starting LPR3 component integration")
-    logger.debug(f"LPR3 kontakter schema: {lpr3_kontakter.collect_schema()}")
-    logger.debug(f"LPR3 diagnoser schema: {lpr3_diagnoser.collect_schema()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"LPR3 kontakter schema: {lpr3_kontakter.collect_schema()}")
+        logger.debug(f"LPR3 diagnoser schema: {lpr3_diagnoser.collect_schema()}")
 
     lpr3_integrated = lpr3_kontakter.join(
         lpr3_diagnoser, left_on="DW_EK_KONTAKT", right_on="DW_EK_KONTAKT", how="left"
     )
-    logger.debug(f"LPR3 integrated schema: {lpr3_integrated.collect_schema()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"LPR3 integrated schema: {lpr3_integrated.collect_schema()}")
 
     return lpr3_integrated
 
@@ -71,8 +79,9 @@ def harmonize_health_data(
         tuple[pl.LazyFrame, pl.LazyFrame]: Tuple containing harmonized LPR2 and LPR3 data.
     """
     logger.debug("Starting health data harmonization")
-    logger.debug(f"Input DF1 (LPR2) schema: {df1.collect_schema()}")
-    logger.debug(f"Input DF2 (LPR3) schema: {df2.collect_schema()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Input DF1 (LPR2) schema: {df1.collect_schema()}")
+        logger.debug(f"Input DF2 (LPR3) schema: {df2.collect_schema()}")
 
     column_mappings = {
         # Patient identifier
@@ -115,11 +124,10 @@ def harmonize_health_data(
     }
 
     def rename_columns(df: pl.LazyFrame) -> pl.LazyFrame:
-        for old_name, new_name in column_mappings.items():
-            if old_name in df.collect_schema().names():
-                df = df.rename({old_name: new_name})
-                logger.debug(f"Renamed column '{old_name}' to '{new_name}'")
-        return df
+        names = set(df.collect_schema().names())
+        renames = {old: new for old, new in column_mappings.items() if old in names}
+        logger.debug(f"Renaming columns: {renames}")
+        return df.rename(renames)
 
     df1_harmonized = rename_columns(df1)
     df2_harmonized = rename_columns(df2)
@@ -127,8 +135,9 @@ def harmonize_health_data(
     df1_harmonized = df1_harmonized.with_columns(pl.lit("LPR2").alias("source"))
     df2_harmonized = df2_harmonized.with_columns(pl.lit("LPR3").alias("source"))
 
-    logger.debug(f"Harmonized DF1 (LPR2) schema: {df1_harmonized.collect_schema()}")
-    logger.debug(f"Harmonized DF2 (LPR3) schema: {df2_harmonized.collect_schema()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Harmonized DF1 (LPR2) schema: {df1_harmonized.collect_schema()}")
+        logger.debug(f"Harmonized DF2 (LPR3) schema: {df2_harmonized.collect_schema()}")
 
     return df1_harmonized, df2_harmonized
 
@@ -145,34 +154,33 @@ def combine_harmonized_data(df1: pl.LazyFrame, df2: pl.LazyFrame) -> pl.LazyFram
         pl.LazyFrame: Combined and harmonized health data.
     """
     logger.debug("Starting combination of harmonized data")
-    logger.debug(f"Input DF1 schema: {df1.collect_schema()}")
-    logger.debug(f"Input DF2 schema: {df2.collect_schema()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Input DF1 schema: {df1.collect_schema()}")
+        logger.debug(f"Input DF2 schema: {df2.collect_schema()}")
 
-    all_columns = set(df1.collect_schema().names()).union(set(df2.collect_schema().names()))
+    df1_columns = set(df1.collect_schema().names())
+    df2_columns = set(df2.collect_schema().names())
+    all_columns = sorted(df1_columns | df2_columns)
     logger.debug(f"All unique columns: {all_columns}")
-
-    for col in all_columns:
-        if col not in df1.collect_schema().names():
-            df1 = df1.with_columns(pl.lit(None).cast(pl.Utf8).alias(col))
-            logger.debug(f"Added missing column '{col}' to DF1")
-        else:
-            df1 = df1.with_columns(pl.col(col).cast(pl.Utf8))
-
-        if col not in df2.collect_schema().names():
-            df2 = df2.with_columns(pl.lit(None).cast(pl.Utf8).alias(col))
-            logger.debug(f"Added missing column '{col}' to DF2")
-        else:
-            df2 = df2.with_columns(pl.col(col).cast(pl.Utf8))
-
-    df1 = df1.select(sorted(all_columns))
-    df2 = df2.select(sorted(all_columns))
-
-    combined_df = pl.concat([df1, df2])
-    logger.debug(f"Combined dataframe schema: {combined_df.collect_schema()}")
+    logger.debug(f"Columns missing from DF1: {sorted(df2_columns - df1_columns)}")
+    logger.debug(f"Columns missing from DF2: {sorted(df1_columns - df2_columns)}")
+
+    def align(df: pl.LazyFrame, columns: set[str]) -> pl.LazyFrame:
+        return df.select(
+            [
+                pl.col(col).cast(pl.Utf8) if col in columns else pl.lit(None).cast(pl.Utf8).alias(col)
+                for col in all_columns
+            ]
+        )
+
+    # Both sides share an all-Utf8 schema, so skip the rechunk copy of the combined table
+    combined_df = pl.concat([align(df1, df1_columns), align(df2, df2_columns)], rechunk=False)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Combined dataframe schema: {combined_df.collect_schema()}")
 
     date_columns = ["admission_date", "outpatient_date"]
     for col in date_columns:
-        if col in combined_df.collect_schema().names():
+        if col in all_columns:
             combined_df = combined_df.with_columns(parse_dates(col).alias(col))
             logger.debug(f"Parsed dates for column '{col}'")
 
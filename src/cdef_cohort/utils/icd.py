@@ -1,22 +1,273 @@
+from functools import lru_cache
+
 import polars as pl
 
 from cdef_cohort.logging_config import logger
-from cdef_cohort.utils.config import ICD_FILE
-
-
+from cdef_cohort.utils.config import ICD_FILE, ICD_PARQUET_FILE
+
+# ICD-10 codes (three characters, without the leading "D" of Danish codes) that define a
+# severe chronic disease
+SCD_CODES = [
+    "D55",
+    "D56",
+    "D57",
+    "D58",
+    "D60",
+    "D61",
+    "D64",
+    "D66",
+    "D67",
+    "D68",
+    "D69",
+    "D70",
+    "D71",
+    "D72",
+    "D73",
+    "D76",
+    "D80",
+    "D81",
+    "D82",
+    "D83",
+    "D84",
+    "D86",
+    "D89",
+    "E22",
+    "E23",
+    "E24",
+    "E25",
+    "E26",
+    "E27",
+    "E31",
+    "E34",
+    "E70",
+    "E71",
+    "E72",
+    "E73",
+    "E74",
+    "E75",
+    "E76",
+    "E77",
+    "E78",
+    "E79",
+    "E80",
+    "E83",
+    "E84",
+    "E85",
+    "E88",
+    "F84",
+    "G11",
+    "G12",
+    "G13",
+    "G23",
+    "G24",
+    "G25",
+    "G31",
+    "G32",
+    "G36",
+    "G37",
+    "G40",
+    "G41",
+    "G60",
+    "G70",
+    "G71",
+    "G72",
+    "G73",
+    "G80",
+    "G81",
+    "G82",
+    "G83",
+    "G90",
+    "G91",
+    "G93",
+    "I27",
+    "I42",
+    "I43",
+    "I50",
+    "I61",
+    "I63",
+    "I69",
+    "I70",
+    "I71",
+    "I72",
+    "I73",
+    "I74",
+    "I77",
+    "I78",
+    "I79",
+    "J41",
+    "J42",
+    "J43",
+    "J44",
+    "J45",
+    "J47",
+    "J60",
+    "J61",
+    "J62",
+    "J63",
+    "J64",
+    "J65",
+    "J66",
+    "J67",
+    "J68",
+    "J69",
+    "J70",
+    "J84",
+    "J98",
+    "K50",
+    "K51",
+    "K73",
+    "K74",
+    "K86",
+    "K87",
+    "K90",
+    "M05",
+    "M06",
+    "M07",
+    "M08",
+    "M09",
+    "M30",
+    "M31",
+    "M32",
+    "M33",
+    "M34",
+    "M35",
+    "M40",
+    "M41",
+    "M42",
+    "M43",
+    "M45",
+    "M46",
+    "N01",
+    "N03",
+    "N04",
+    "N07",
+    "N08",
+    "N11",
+    "N12",
+    "N13",
+    "N14",
+    "N15",
+    "N16",
+    "N18",
+    "N19",
+    "N20",
+    "N21",
+    "N22",
+    "N23",
+    "N25",
+    "N26",
+    "N27",
+    "N28",
+    "N29",
+    "P27",
+    "Q01",
+    "Q02",
+    "Q03",
+    "Q04",
+    "Q05",
+    "Q06",
+    "Q07",
+    "Q20",
+    "Q21",
+    "Q22",
+    "Q23",
+    "Q24",
+    "Q25",
+    "Q26",
+    "Q27",
+    "Q28",
+    "Q30",
+    "Q31",
+    "Q32",
+    "Q33",
+    "Q34",
+    "Q35",
+    "Q36",
+    "Q37",
+    "Q38",
+    "Q39",
+    "Q40",
+    "Q41",
+    "Q42",
+    "Q43",
+    "Q44",
+    "Q45",
+    "Q60",
+    "Q61",
+    "Q62",
+    "Q63",
+    "Q64",
+    "Q65",
+    "Q66",
+    "Q67",
+    "Q68",
+    "Q69",
+    "Q70",
+    "Q71",
+    "Q72",
+    "Q73",
+    "Q74",
+    "Q75",
+    "Q76",
+    "Q77",
+    "Q78",
+    "Q79",
+    "Q80",
+    "Q81",
+    "Q82",
+    "Q83",
+    "Q84",
+    "Q85",
+    "Q86",
+    "Q87",
+    "Q89",
+    "Q90",
+    "Q91",
+    "Q92",
+    "Q93",
+    "Q95",
+    "Q96",
+    "Q97",
+    "Q98",
+    "Q99",
+]
+
+# One anchored, case-insensitive pattern applied to the full diagnosis code (the first
+# character is the "D" prefix). It matches what the former slice comparisons matched:
+# - a listed code with nothing after it
+# - codes from "E74" up to "E84" compared as strings, i.e. "E7" followed by any character
+#   from "4" up (including letters), "E8" followed by any character up to "3", E8 and E84
+# - codes from "P941" up to "P949" compared as strings, i.e. P941*-P948* and P949
+SCD_CODE_PATTERN = (
+    "(?i)^.(?:(?:"
+    + "|".join(SCD_CODES)
+    + r")$|E7[^\x00-3]|E8$|E8[\x00-3]|E84$|P94[1-8]|P949$)"
+)
+
+
+@lru_cache(maxsize=1)
 def read_icd_descriptions() -> pl.LazyFrame:
     """
     Read ICD-10 code descriptions from a CSV file.
 
+    Like the ISCED data, the parsed CSV is saved as a parquet file, which later runs read
+    instead of parsing the CSV again (unless the CSV has changed since). The table is small,
+    so it is kept in memory; repeated calls return the cached LazyFrame.
+
     Returns:
         pl.LazyFrame: A LazyFrame containing ICD-10 codes and their descriptions.
 
     """
-    logger.debug(f"Reading ICD-10 descriptions from file: {ICD_FILE}")
-    df = pl.scan_csv(ICD_FILE)
-    logger.debug(f"ICD-10 descriptions schema: {df.collect_schema()}")
-    logger.debug(f"Number of ICD-10 descriptions loaded: {df.collect().shape[0]}")
-    return df
+    if ICD_PARQUET_FILE.exists() and ICD_PARQUET_FILE.stat().st_mtime >= ICD_FILE.stat().st_mtime:
+        logger.debug(f"Reading ICD-10 descriptions from parquet file: {ICD_PARQUET_FILE}")
+        df = pl.read_parquet(ICD_PARQUET_FILE)
+    else:
+        logger.debug(f"Reading ICD-10 descriptions from file: {ICD_FILE}")
+        df = pl.read_csv(ICD_FILE)
+        df.write_parquet(ICD_PARQUET_FILE)
+    logger.debug(f"ICD-10 descriptions schema: {df.schema}")
+    logger.debug(f"Number of ICD-10 descriptions loaded: {df.height}")
+    return df.lazy()
 
 
 def apply_scd_algorithm_single(
@@ -36,263 +287,22 @@ def apply_scd_algorithm_single(
     """
     logger.debug(f"Applying SCD algorithm with diagnosis columns: {diagnosis_columns}")
     logger.debug(f"Date column: {date_column}, Patient ID column: {patient_id_column}")
-    scd_codes = [
-        "D55",
-        "D56",
-        "D57",
-        "D58",
-        "D60",
-        "D61",
-        "D64",
-        "D66",
-        "D67",
-        "D68",
-        "D69",
-        "D70",
-        "D71",
-        "D72",
-        "D73",
-        "D76",
-        "D80",
-        "D81",
-        "D82",
-        "D83",
-        "D84",
-        "D86",
-        "D89",
-        "E22",
-        "E23",
-        "E24",
-        "E25",
-        "E26",
-        "E27",
-        "E31",
-        "E34",
-        "E70",
-        "E71",
-        "E72",
-        "E73",
-        "E74",
-        "E75",
-        "E76",
-        "E77",
-        "E78",
-        "E79",
-        "E80",
-        "E83",
-        "E84",
-        "E85",
-        "E88",
-        "F84",
-        "G11",
-        "G12",
-        "G13",
-        "G23",
-        "G24",
-        "G25",
-        "G31",
-        "G32",
-        "G36",
-        "G37",
-        "G40",
-        "G41",
-        "G60",
-        "G70",
-        "G71",
-        "G72",
-        "G73",
-        "G80",
-        "G81",
-        "G82",
-        "G83",
-        "G90",
-        "G91",
-        "G93",
-        "I27",
-        "I42",
-        "I43",
-        "I50",
-        "I61",
-        "I63",
-        "I69",
-        "I70",
-        "I71",
-        "I72",
-        "I73",
-        "I74",
-        "I77",
-        "I78",
-        "I79",
-        "J41",
-        "J42",
-        "J43",
-        "J44",
-        "J45",
-        "J47",
-        "J60",
-        "J61",
-        "J62",
-        "J63",
-        "J64",
-        "J65",
-        "J66",
-        "J67",
-        "J68",
-        "J69",
-        "J70",
-        "J84",
-        "J98",
-        "K50",
-        "K51",
-        "K73",
-        "K74",
-        "K86",
-        "K87",
-        "K90",
-        "M05",
-        "M06",
-        "M07",
-        "M08",
-        "M09",
-        "M30",
-        "M31",
-        "M32",
-        "M33",
-        "M34",
-        "M35",
-        "M40",
-        "M41",
-        "M42",
-        "M43",
-        "M45",
-        "M46",
-        "N01",
-        "N03",
-        "N04",
-        "N07",
-        "N08",
-        "N11",
-        "N12",
-        "N13",
-        "N14",
-        "N15",
-        "N16",
-        "N18",
-        "N19",
-        "N20",
-        "N21",
-        "N22",
-        "N23",
-        "N25",
-        "N26",
-        "N27",
-        "N28",
-        "N29",
-        "P27",
-        "Q01",
-        "Q02",
-        "Q03",
-        "Q04",
-        "Q05",
-        "Q06",
-        "Q07",
-        "Q20",
-        "Q21",
-        "Q22",
-        "Q23",
-        "Q24",
-        "Q25",
-        "Q26",
-        "Q27",
-        "Q28",
-        "Q30",
-        "Q31",
-        "Q32",
-        "Q33",
-        "Q34",
-        "Q35",
-        "Q36",
-        "Q37",
-        "Q38",
-        "Q39",
-        "Q40",
-        "Q41",
-        "Q42",
-        "Q43",
-        "Q44",
-        "Q45",
-        "Q60",
-        "Q61",
-        "Q62",
-        "Q63",
-        "Q64",
-        "Q65",
-        "Q66",
-        "Q67",
-        "Q68",
-        "Q69",
-        "Q70",
-        "Q71",
-        "Q72",
-        "Q73",
-        "Q74",
-        "Q75",
-        "Q76",
-        "Q77",
-        "Q78",
-        "Q79",
-        "Q80",
-        "Q81",
-        "Q82",
-        "Q83",
-        "Q84",
-        "Q85",
-        "Q86",
-        "Q87",
-        "Q89",
-        "Q90",
-        "Q91",
-        "Q92",
-        "Q93",
-        "Q95",
-        "Q96",
-        "Q97",
-        "Q98",
-        "Q99",
-    ]
-    logger.debug(f"Number of SCD codes: {len(scd_codes)}")
-    scd_conditions = []
-    for diag_col in diagnosis_columns:
-        scd_condition = (
-            pl.col(diag_col).str.to_uppercase().str.slice(1, 4).is_in(scd_codes)
-            | pl.col(diag_col).str.to_uppercase().str.slice(1, 5).is_in(scd_codes)
-            | (
-                (pl.col(diag_col).str.to_uppercase().str.slice(1, 4) >= pl.lit("E74"))
-                & (pl.col(diag_col).str.to_uppercase().str.slice(1, 4) <= pl.lit("E84"))
-            )
-            | (
-                (pl.col(diag_col).str.to_uppercase().str.slice(1, 5) >= pl.lit("P941"))
-                & (pl.col(diag_col).str.to_uppercase().str.slice(1, 5) <= pl.lit("P949"))
-            )
-        )
-        scd_conditions.append(scd_condition)
+    logger.debug(f"Number of SCD codes: {len(SCD_CODES)}")
+    # A single regex scan per diagnosis column covers the code list and both ranges
+    scd_conditions = [pl.col(diag_col).str.contains(SCD_CODE_PATTERN) for diag_col in diagnosis_columns]
 
     logger.debug(f"Number of SCD conditions created: {len(scd_conditions)}")
     is_scd_expr = pl.any_horizontal(*scd_conditions)
 
-    result = df.with_columns(
-        [
-            is_scd_expr.alias("is_scd"),
-            pl.when(is_scd_expr).then(pl.col(date_column)).otherwise(None).alias("first_scd_date"),
-        ]
-    )
+    result = df.with_columns(is_scd_expr.alias("is_scd"))
     logger.debug("SCD conditions applied to dataframe")
 
-    # Aggregate to patient level
+    # Aggregate to patient level; the earliest SCD date is taken over the SCD records only,
+    # instead of materializing a null-padded date column first
     aggregated = result.group_by(patient_id_column).agg(
         [
             pl.col("is_scd").max().alias("is_scd"),
-            pl.col("first_scd_date").min().alias("first_scd_date"),
+            pl.col(date_column).filter(pl.col("is_scd")).min().alias("first_scd_date"),
         ]
     )
 
@@ -302,6 +312,32 @@ def apply_scd_algorithm_single(
     return aggregated
 
 
+def icd_description_columns(code: pl.Expr, icd_descriptions: pl.DataFrame, suffix: str = "") -> list[pl.Expr]:
+    """
+    Look up the descriptions of ICD-10 codes without joining.
+
+    Each description column is gathered with replace_strict against the (small) descriptions
+    table. The names and values match a left join on 'icd10' with the given suffix, except that
+    a code listed more than once gets its first description instead of duplicating the row.
+
+    Args:
+        code (pl.Expr): Expression giving the ICD-10 codes to look up.
+        icd_descriptions (pl.DataFrame): ICD-10 codes in 'icd10' and their description columns.
+        suffix (str): Suffix added to the description column names.
+
+    Returns:
+        list[pl.Expr]: One expression per description column; codes without a description are null.
+    """
+    # replace_strict requires unique keys
+    icd_descriptions = icd_descriptions.unique(subset="icd10", keep="first", maintain_order=True)
+    keys = icd_descriptions.get_column("icd10")
+    return [
+        code.replace_strict(keys, icd_descriptions.get_column(col), default=None).alias(f"{col}{suffix}")
+        for col in icd_descriptions.columns
+        if col != "icd10"
+    ]
+
+
 def add_icd_descriptions(df: pl.LazyFrame, icd_descriptions: pl.LazyFrame) -> pl.LazyFrame:
     """
     Add ICD-10 descriptions to the dataframe.
@@ -318,27 +354,13 @@ def add_icd_descriptions(df: pl.LazyFrame, icd_descriptions: pl.LazyFrame) -> pl
     logger.debug(f"Input dataframe schema: {df.collect_schema()}")
     logger.debug(f"ICD descriptions schema: {icd_descriptions.collect_schema()}")
 
-    result = (
-        df.with_columns(
-            [
-                pl.col("C_ADIAG").str.slice(1).alias("icd_code_adiag"),
-                pl.col("C_DIAG").str.slice(1).alias("icd_code_diag"),
-            ],
-        )
-        .join(
-            icd_descriptions,
-            left_on="icd_code_adiag",
-            right_on="icd10",
-            how="left",
-        )
-        .join(
-            icd_descriptions,
-            left_on="icd_code_diag",
-            right_on="icd10",
-            how="left",
-            suffix="_diag",
-        )
-        .drop(["icd_code_adiag", "icd_code_diag"])
+    # The descriptions table is small, so collect it once and gather from it instead of joining
+    descriptions = icd_descriptions.collect()
+    result = df.with_columns(
+        [
+            *icd_description_columns(pl.col("C_ADIAG").str.slice(1), descriptions),
+            *icd_description_columns(pl.col("C_DIAG").str.slice(1), descriptions, suffix="_diag"),
+        ]
     )
 
     logger.debug(f"Result schema after adding ICD descriptions: {result.collect_schema()}")
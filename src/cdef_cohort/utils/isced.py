@@ -1,4 +1,5 @@
 import json
+from functools import lru_cache
 
 import polars as pl
 
@@ -6,13 +7,15 @@ from cdef_cohort.logging_config import logger
 from cdef_cohort.utils.config import ISCED_FILE, ISCED_MAPPING_FILE
 
 
+@lru_cache(maxsize=1)
 def read_isced_data() -> pl.LazyFrame:
     """
     Read and process ISCED (International Standard Classification of Education) data.
 
     This function attempts to read ISCED data from a pre-existing parquet file.
     If the file doesn't exist, it processes the data from a JSON file, saves it as a parquet file,
-    and returns the processed data.
+    and returns the processed data. The result is cached, so repeated calls reuse the same
+    LazyFrame instead of checking for the file and parsing the JSON again.
 
     Returns:
         pl.LazyFrame:
@@ -33,21 +36,13 @@ def read_isced_data() -> pl.LazyFrame:
         with open(ISCED_MAPPING_FILE) as json_file:
             isced_data = json.load(json_file)
 
-        # Convert the JSON data to a Polars DataFrame
-        isced_df = pl.DataFrame(
-            [{"HFAUDD": key, "EDU_LVL": value} for key, value in isced_data.items()]
-        )
-
-        # Process the data
-        isced_final = (
-            isced_df.with_columns(
-                [
-                    pl.col("HFAUDD").cast(pl.Utf8),
-                    pl.col("EDU_LVL").cast(pl.Utf8),
-                ]
-            )
-            .unique()
-            .select(["HFAUDD", "EDU_LVL"])
+        # Build the columns as strings directly; the JSON keys are unique, so every row is too
+        isced_final = pl.DataFrame(
+            {
+                "HFAUDD": list(isced_data.keys()),
+                "EDU_LVL": [None if value is None else str(value) for value in isced_data.values()],
+            },
+            schema={"HFAUDD": pl.Utf8, "EDU_LVL": pl.Utf8},
         )
 
         # Write to parquet file
@@ -0,0 +1,45 @@
+import polars as pl
+
+from cdef_cohort.services.cohort_service import CohortService
+from cdef_cohort.services.data_service import DataService
+from cdef_cohort.services.event_service import EventService
+from cdef_cohort.services.mapping_service import MappingService
+
+
+def test_process_events_with_change_definitions(tmp_path):
+    """Events defined with diff/pct_change are identified and written to the events file."""
+    service = CohortService(DataService(), EventService(), MappingService(tmp_path))
+    data = pl.LazyFrame(
+        {
+            "PNR": ["1", "1", "1", "2", "2"],
+            "year": [2000, 2001, 2002, 2000, 2001],
+            "income": [100.0, 100.0, 150.0, 200.0, 100.0],
+        }
+    )
+    event_definitions = {
+        "income_change": pl.col("income").diff() != 0,
+        "significant_income_increase": pl.col("income").pct_change() > 0.10,
+    }
+    output_file = tmp_path / "events.parquet"
+
+    result = service.process_events(data, event_definitions, output_file).collect().sort(["event_type", "PNR", "year"])
+
+    assert output_file.exists()
+    assert result.select("event_type", "PNR", "year").to_dicts() == [
+        {"event_type": "income_change", "PNR": "1", "year": 2002},
+        {"event_type": "income_change", "PNR": "2", "year": 2000},
+        {"event_type": "income_change", "PNR": "2", "year": 2001},
+        {"event_type": "significant_income_increase", "PNR": "1", "year": 2002},
+        {"event_type": "significant_income_increase", "PNR": "2", "year": 2000},
+    ]
+
+
+def test_process_events_without_definitions(tmp_path):
+    """Without event definitions the data is written unchanged."""
+    service = CohortService(DataService(), EventService(), MappingService(tmp_path))
+    data = pl.LazyFrame({"PNR": ["2", "1"], "year": [2000, 2001]})
+    output_file = tmp_path / "events.parquet"
+
+    result = service.process_events(data, {}, output_file).collect()
+
+    assert result.to_dicts() == [{"PNR": "2", "year": 2000}, {"PNR": "1", "year": 2001}]
@@ -23,6 +23,7 @@ def test_data_service_read_write(test_data_dir: Path):
     assert result.collect_schema() == test_df.collect_schema()
     assert result.collect().shape == test_df.collect().shape
 
+
 def test_data_service_schema_validation():
     # Arrange
     service = DataService()
@@ -41,3 +42,41 @@ def test_data_service_schema_validation():
 
     # Assert
     assert is_valid
+
+
+def test_data_service_write_unstreamable_plan(test_data_dir: Path):
+    # Arrange
+    service = DataService()
+    test_df = pl.LazyFrame(
+        {
+            "PNR": ["a", "a", "b"],
+            "income": [1.0, 2.0, 4.0],
+        }
+    ).with_columns(pl.col("income").diff().over("PNR").alias("income_change"))
+
+    test_file = test_data_dir / "events.parquet"
+
+    # Act
+    service.write_parquet(test_df, test_file)
+
+    # Assert
+    assert pl.read_parquet(test_file).equals(test_df.collect())
+
+
+def test_data_service_write_ipc_unstreamable_plan(test_data_dir: Path):
+    # Arrange
+    service = DataService()
+    test_df = pl.LazyFrame(
+        {
+            "PNR": ["a", "b"],
+            "FOED_DAG": [1, 2],
+        }
+    ).cache()
+
+    test_file = test_data_dir / "population.arrow"
+
+    # Act
+    service.write_ipc(test_df, test_file)
+
+    # Assert
+    assert pl.read_ipc(test_file).equals(test_df.collect())
@@ -0,0 +1,28 @@
+from datetime import date
+
+import polars as pl
+
+from cdef_cohort.utils.date import parse_dates_sampled
+
+EXPECTED_DATES = [date(2001, 2, 3), date(2002, 3, 4), date(2003, 4, 5), date(2004, 5, 6)]
+
+
+def test_parse_dates_sampled_across_files(tmp_path):
+    """A file with a different date format than the first file is still parsed."""
+    pl.DataFrame({"FOED_DAG": ["2001-02-03", "2002-03-04"]}).write_parquet(tmp_path / "bef_2001.parquet")
+    pl.DataFrame({"FOED_DAG": ["05/04/2003", "06/05/2004"]}).write_parquet(tmp_path / "bef_2003.parquet")
+    source = tmp_path / "*.parquet"
+    data = pl.scan_parquet(source)
+
+    result = data.with_columns(parse_dates_sampled(data, ["FOED_DAG"], source=source)).collect()
+
+    assert result["FOED_DAG"].to_list() == EXPECTED_DATES
+
+
+def test_parse_dates_sampled_falls_back_on_unsampled_format():
+    """Values in a format missing from the sample fall back to trying all formats."""
+    data = pl.LazyFrame({"FOED_DAG": ["2001-02-03", "2002-03-04", "05/04/2003", "06/05/2004", None]})
+
+    result = data.with_columns(parse_dates_sampled(data, ["FOED_DAG"], sample_size=2)).collect()
+
+    assert result["FOED_DAG"].to_list() == [*EXPECTED_DATES, None]
@@ -0,0 +1,117 @@
+import os
+
+import polars as pl
+import pytest
+
+from cdef_cohort.registers.generic import process_longitudinal_data, process_register_data
+
+
+@pytest.fixture
+def population_file(tmp_path):
+    """Create a small population file."""
+    path = tmp_path / "population.parquet"
+    pl.DataFrame(
+        {
+            "PNR": ["1", "2", "3"],
+            "FAR_ID": ["F1", "F2", None],
+            "MOR_ID": ["M1", None, "M3"],
+        }
+    ).write_parquet(path)
+    return path
+
+
+@pytest.fixture
+def register_file(tmp_path):
+    """Create a small register file with children, parents and people outside the population."""
+    path = tmp_path / "register.parquet"
+    pl.DataFrame(
+        {
+            "PNR": ["1", "3", "F1", "M3", "X"],
+            "VALUE": [10, 30, 100, 300, 999],
+        }
+    ).write_parquet(path)
+    return path
+
+
+@pytest.mark.parametrize("write_ipc_copy", [False, True])
+def test_join_with_population(tmp_path, population_file, register_file, write_ipc_copy):
+    """Every population row is kept and only matching register rows are joined."""
+    if write_ipc_copy:
+        pl.read_parquet(population_file).write_ipc(population_file.with_suffix(".arrow"))
+    output_file = tmp_path / "output.parquet"
+
+    process_register_data(
+        register_file,
+        output_file,
+        schema={},
+        defaults={"population_file": population_file, "join_parents_only": False},
+    )
+
+    result = pl.read_parquet(output_file)
+    assert result.columns == ["PNR", "FAR_ID", "MOR_ID", "VALUE"]
+    assert result.select("PNR", "VALUE").to_dicts() == [
+        {"PNR": "1", "VALUE": 10},
+        {"PNR": "2", "VALUE": None},
+        {"PNR": "3", "VALUE": 30},
+    ]
+
+
+def test_join_with_stale_ipc_population(tmp_path, population_file, register_file):
+    """An IPC copy older than the population parquet file is ignored."""
+    ipc_file = population_file.with_suffix(".arrow")
+    pl.DataFrame({"PNR": ["X"], "FAR_ID": [None], "MOR_ID": [None]}).write_ipc(ipc_file)
+    population_mtime = population_file.stat().st_mtime
+    os.utime(ipc_file, (population_mtime - 60, population_mtime - 60))
+    output_file = tmp_path / "output.parquet"
+
+    process_register_data(
+        register_file,
+        output_file,
+        schema={},
+        defaults={"population_file": population_file, "join_parents_only": False},
+    )
+
+    result = pl.read_parquet(output_file)
+    assert result["PNR"].to_list() == ["1", "2", "3"]
+
+
+def test_join_parents_with_population(tmp_path, population_file, register_file):
+    """Parent joins add FAR_/MOR_ prefixed register columns for each child."""
+    output_file = tmp_path / "output.parquet"
+
+    process_register_data(
+        register_file,
+        output_file,
+        schema={},
+        defaults={"population_file": population_file, "join_parents_only": True},
+    )
+
+    result = pl.read_parquet(output_file)
+    assert result.select("PNR", "FAR_VALUE", "MOR_VALUE").to_dicts() == [
+        {"PNR": "1", "FAR_VALUE": 100, "MOR_VALUE": None},
+        {"PNR": "2", "FAR_VALUE": None, "MOR_VALUE": None},
+        {"PNR": "3", "FAR_VALUE": None, "MOR_VALUE": 300},
+    ]
+
+
+def test_process_longitudinal_data(tmp_path):
+    """Year and month are taken from each file name, not from the directory path."""
+    register_dir = tmp_path / "lpr_1999"
+    register_dir.mkdir()
+    pl.DataFrame({"PNR": ["1"]}).write_parquet(register_dir / "register_202103.parquet")
+    pl.DataFrame({"PNR": ["2"]}).write_parquet(register_dir / "register_2019.parquet")
+
+    result = process_longitudinal_data(register_dir / "*.parquet", None).collect().sort("PNR")
+
+    assert result.rows() == [("1", 2021, 3), ("2", 2019, None)]
+
+
+def test_process_register_data_without_files(tmp_path, population_file):
+    """A pattern matching no files fails before any data is scanned."""
+    with pytest.raises(FileNotFoundError, match="No parquet files found"):
+        process_register_data(
+            tmp_path / "missing_*.parquet",
+            tmp_path / "output.parquet",
+            schema={},
+            defaults={"population_file": population_file},
+        )
@@ -0,0 +1,67 @@
+import polars as pl
+import pytest
+
+from cdef_cohort.utils.icd import SCD_CODE_PATTERN, SCD_CODES, icd_description_columns
+
+
+def old_scd_condition(diag_col: str) -> pl.Expr:
+    """The slice comparisons SCD_CODE_PATTERN replaced."""
+    upper_diag = pl.col(diag_col).str.to_uppercase()
+    code3 = upper_diag.str.slice(1, 4)
+    code4 = upper_diag.str.slice(1, 5)
+    return (
+        code3.is_in(SCD_CODES)
+        | code4.is_in(SCD_CODES)
+        | ((code3 >= pl.lit("E74")) & (code3 <= pl.lit("E84")))
+        | ((code4 >= pl.lit("P941")) & (code4 <= pl.lit("P949")))
+    )
+
+
+@pytest.mark.parametrize(
+    ("code", "is_scd"),
+    [
+        ("DG40", True),
+        ("dg40", True),
+        ("DG401", False),
+        ("DG4", False),
+        ("DZ00", False),
+        ("DE73", True),
+        ("DE74", True),
+        ("DE749", True),
+        ("DE7X", True),
+        ("DE7", False),
+        ("DE8", True),
+        ("DE82", True),
+        ("DE8.1", True),
+        ("DE84", True),
+        ("DE841", False),
+        ("DE85", True),
+        ("DE86", False),
+        ("DP94", False),
+        ("DP940", False),
+        ("DP941", True),
+        ("DP9489", True),
+        ("DP949", True),
+        ("DP9491", False),
+    ],
+)
+def test_scd_code_pattern_matches_old_expression(code, is_scd):
+    """The pattern flags the same codes as the slice comparisons it replaced."""
+    df = pl.DataFrame({"diagnosis": [code]})
+
+    result = df.select(
+        new=pl.col("diagnosis").str.contains(SCD_CODE_PATTERN),
+        old=old_scd_condition("diagnosis"),
+    )
+
+    assert result.row(0) == (is_scd, is_scd)
+
+
+def test_icd_description_columns_with_duplicate_codes():
+    """A code listed more than once gets its first description."""
+    icd_descriptions = pl.DataFrame({"icd10": ["A00", "B01", "A00"], "description": ["first", "other", "second"]})
+    df = pl.DataFrame({"diagnosis": ["A00", "B01", "C02"]})
+
+    result = df.select(icd_description_columns(pl.col("diagnosis"), icd_descriptions, suffix="_diag"))
+
+    assert result["description_diag"].to_list() == ["first", "other", None]
@@ -0,0 +1,34 @@
+import json
+
+import polars as pl
+import pytest
+
+from cdef_cohort.services.mapping_service import MappingService
+
+
+@pytest.fixture
+def mapping_service(tmp_path):
+    """Create a mapping service with an ISCED mapping."""
+    (tmp_path / "isced.json").write_text(json.dumps({"10": "1", "20": "2"}))
+    service = MappingService(tmp_path)
+    service.initialize()
+    return service
+
+
+def test_apply_isced_mapping(mapping_service):
+    """Mapped codes are replaced, unmapped codes are kept and nulls stay null."""
+    df = pl.LazyFrame({"HFAUDD": [10, 20, 30, None]})
+
+    result = mapping_service.apply_isced_mapping(df).collect()
+
+    assert result["EDU_LVL"].to_list() == ["1", "2", "30", None]
+
+
+def test_apply_mapping(tmp_path, mapping_service):
+    """Named mappings replace codes, keep unmapped codes and map to null where the value is null."""
+    (tmp_path / "statsb.json").write_text(json.dumps({"5100": "Denmark", "5170": None}))
+    df = pl.LazyFrame({"code": [5100, 5170, 5999]})
+
+    result = df.select(mapping_service.apply_mapping(pl.col("code"), "statsb", pl.Utf8)).collect()
+
+    assert result["code"].to_list() == ["Denmark", None, "5999"]
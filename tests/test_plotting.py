@@ -0,0 +1,21 @@
+import polars as pl
+
+from cdef_cohort.events.plotting import build_plot_plans, save_sankey_data
+
+
+def test_save_sankey_data(tmp_path):
+    """Transitions are counted per person, bucketed into 'Other' and summed per edge."""
+    events = pl.LazyFrame(
+        {
+            "PNR": ["1", "1", "1", "2", "2", "3", "3", "4"],
+            "event_type": ["a", "b", "c", "a", "b", "b", "d", "a"],
+            "year": [2000, 2001, 2002, 2003, 2004, 2000, 2001, 2000],
+        }
+    )
+    plans = build_plot_plans(events, ["a", "b", "c", "d"])
+    edges, event_type_counts = pl.collect_all([plans["sankey_edges"], plans["event_type_counts"]])
+
+    save_sankey_data(edges, event_type_counts, top_n=2, min_count=1, output_dir=tmp_path)
+
+    result = pl.read_csv(tmp_path / "sankey_data.csv").sort(["source", "target"])
+    assert result.rows() == [("a", "b", 2), ("b", "Other", 2)]
@@ -0,0 +1,17 @@
+import polars as pl
+import pytest
+
+from cdef_cohort.services.data_service import DataService
+from cdef_cohort.services.table_service import TableService
+
+
+def test_create_table_one_missing_year(tmp_path):
+    """A study year without longitudinal statistics fails the table instead of being skipped."""
+    stats_path = tmp_path / "derived" / "statistics"
+    (stats_path / "longitudinal").mkdir(parents=True)
+    pl.DataFrame({"column": ["other"]}).write_parquet(stats_path / "family_statistics.parquet")
+    service = TableService(DataService())
+    service.configure({"output_dir": tmp_path, "study_years": [2000], "analytical_data_path": tmp_path})
+
+    with pytest.raises(FileNotFoundError, match="mother_characteristics_2000"):
+        service.create_table_one()